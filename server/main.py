@@ -1,5 +1,7 @@
-from fastapi import FastAPI, HTTPException, Depends, Request, BackgroundTasks, UploadFile, File
+from fastapi import FastAPI, HTTPException, Depends, Request, BackgroundTasks, UploadFile, File, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import List
@@ -26,13 +28,14 @@ from .schemas import (
     JobStepResponse,
     FileUploadResponse,
     AddEdgeRequest,
+    AddEdgesRequest,
     EdgeResponse,
     WorkflowEdgesResponse,
 )
-from .services.pdf_service import pdf_service
+from .services.pdf_service import PDFValidationError, pdf_service
 from .services.llm_service import llm_service
 from .services.formatter_service import formatter_service
-from .services.job_service import job_service
+from .services.job_service import job_service, TERMINAL_JOB_STATUSES
 from .services.agent_service import validate_config as validate_agent_config
 from .services.graph_service import validate_edges_no_cycles
 
@@ -44,7 +47,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Workflow App")
+app = FastAPI(title="Workflow App", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -54,6 +57,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def warm_openapi_schema():
+    """Build the OpenAPI schema once at startup; FastAPI caches it on the app for later requests"""
+    app.openapi()
+
+
 @app.middleware("http")
 async def add_request_logging(request: Request, call_next):
     """Add request ID to all requests and log request/response info"""
@@ -92,14 +101,51 @@ async def add_request_logging(request: Request, call_next):
     return response
 
 
+def validate_node_request(req: AddNodeRequest):
+    """Validate node configuration based on type, raising 400 on failure"""
+    if req.node_type == NodeType.GENERATIVE_AI:
+        is_valid, error_msg = llm_service.validate_config(req.config)
+    elif req.node_type == NodeType.FORMATTER:
+        is_valid, error_msg = formatter_service.validate_config(req.config)
+    elif req.node_type == NodeType.AGENT:
+        is_valid, error_msg = validate_agent_config(req.config)
+    elif req.node_type == NodeType.EXTRACT_TEXT:
+        is_valid, error_msg = pdf_service.validate_config(req.config)
+    else:
+        return
+
+    if not is_valid:
+        raise HTTPException(status_code=400, detail=error_msg)
+
+
 @app.post("/workflows", response_model=CreateWorkflowResponse)
 def create_workflow(req: CreateWorkflowRequest, db: Session = Depends(get_db)):
-    """Create a new workflow"""
+    """Create a new workflow, optionally with its initial nodes in one request"""
+    for node_req in req.nodes:
+        validate_node_request(node_req)
+
     workflow = WorkflowDB(name=req.name)
     db.add(workflow)
+    db.flush()
+
+    nodes = []
+    for order_index, node_req in enumerate(req.nodes):
+        node = NodeDB(
+            workflow_id=workflow.id,
+            node_type=node_req.node_type.value,
+            config=node_req.config,
+            order_index=order_index
+        )
+        db.add(node)
+        nodes.append(node)
+
     db.commit()
     db.refresh(workflow)
-    return CreateWorkflowResponse(id=workflow.id, name=workflow.name)
+    return CreateWorkflowResponse(
+        id=workflow.id,
+        name=workflow.name,
+        node_ids=[node.id for node in nodes]
+    )
 
 
 @app.get("/workflows/{wf_id}", response_model=WorkflowDetailResponse)
@@ -133,18 +179,7 @@ def add_node(wf_id: str, req: AddNodeRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Workflow not found")
 
     # Validate node configuration based on type
-    if req.node_type == NodeType.GENERATIVE_AI:
-        is_valid, error_msg = llm_service.validate_config(req.config)
-        if not is_valid:
-            raise HTTPException(status_code=400, detail=error_msg)
-    elif req.node_type == NodeType.FORMATTER:
-        is_valid, error_msg = formatter_service.validate_config(req.config)
-        if not is_valid:
-            raise HTTPException(status_code=400, detail=error_msg)
-    elif req.node_type == NodeType.AGENT:
-        is_valid, error_msg = validate_agent_config(req.config)
-        if not is_valid:
-            raise HTTPException(status_code=400, detail=error_msg)
+    validate_node_request(req)
 
     # Get the next order index
     max_order = db.query(NodeDB).filter(NodeDB.workflow_id == wf_id).count()
@@ -198,6 +233,40 @@ def add_edge(wf_id: str, req: AddEdgeRequest, db: Session = Depends(get_db)):
     return {"message": "Edge added", "edge_id": new_edge.id}
 
 
+@app.post("/workflows/{wf_id}/edges/bulk")
+def add_edges(wf_id: str, req: AddEdgesRequest, db: Session = Depends(get_db)):
+    """Add several edges to a workflow at once; all are validated together and saved atomically"""
+    workflow = db.query(WorkflowDB).filter(WorkflowDB.id == wf_id).first()
+    if not workflow:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+
+    nodes = db.query(NodeDB).filter(NodeDB.workflow_id == wf_id).all()
+    existing_edges = db.query(EdgeDB).filter(EdgeDB.workflow_id == wf_id).all()
+
+    new_edges = [
+        EdgeDB(
+            workflow_id=wf_id,
+            from_node_id=edge_req.from_node_id,
+            from_port=edge_req.from_port,
+            to_node_id=edge_req.to_node_id,
+            to_port=edge_req.to_port,
+            condition=edge_req.condition
+        )
+        for edge_req in req.edges
+    ]
+
+    # Validate the combined edge set once
+    try:
+        validate_edges_no_cycles(wf_id, existing_edges + new_edges, nodes)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    db.add_all(new_edges)
+    db.commit()
+
+    return {"message": "Edges added", "edge_ids": [edge.id for edge in new_edges]}
+
+
 @app.get("/workflows/{wf_id}/edges", response_model=WorkflowEdgesResponse)
 def get_workflow_edges(wf_id: str, db: Session = Depends(get_db)):
     """Get all edges for a workflow"""
@@ -355,14 +424,42 @@ def get_run_detail(run_id: str, db: Session = Depends(get_db)):
     raise HTTPException(status_code=404, detail="Run not found")
 
 
-@app.get("/jobs/{job_id}", response_model=Job)
-def get_job(job_id: str, db: Session = Depends(get_db)):
-    """Get job status and details"""
+def _load_job(db: Session, job_id: str):
+    """Fetch a job as its response model, then hand the session's connection back to the pool"""
     job = db.query(JobDB).filter(JobDB.id == job_id).first()
+    result = Job.from_orm(job) if job else None
+    db.close()
+    return result
+
+
+@app.get("/jobs/{job_id}", response_model=Job)
+async def get_job(
+    job_id: str,
+    wait: bool = False,
+    timeout: float = Query(30.0, ge=0, le=60),
+    db: Session = Depends(get_db)
+):
+    """Get job status and details; with wait=true, long-poll until the job finishes or timeout elapses
+
+    Waiting happens on the event loop with no connection checked out, so pollers hold
+    neither a threadpool worker nor a pooled connection while the job runs.
+    """
+    job = await run_in_threadpool(_load_job, db, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    return Job.from_orm(job)
+    if wait:
+        deadline = time.monotonic() + timeout
+        while job.status not in TERMINAL_JOB_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await job_service.wait_for_completion(job_id, remaining)
+            job = await run_in_threadpool(_load_job, db, job_id)
+            if not job:
+                raise HTTPException(status_code=404, detail="Job not found")
+
+    return job
 
 
 @app.get("/jobs/{job_id}/details", response_model=JobDetailResponse)
@@ -385,31 +482,29 @@ def upload_file(file: UploadFile = File(...), db: Session = Depends(get_db)):
     """Upload a PDF file"""
     try:
         # Validate PDF file
-        is_valid, error_msg = pdf_service.validate_pdf(file)
+        is_valid, error = pdf_service.validate_pdf(file)
         if not is_valid:
-            # Check if it's a file size error for proper HTTP status code
-            if error_msg and error_msg.startswith("FILE_TOO_LARGE:"):
-                raise HTTPException(status_code=413, detail=error_msg.replace("FILE_TOO_LARGE:", ""))
-            else:
-                raise HTTPException(status_code=400, detail=error_msg)
+            # Oversized uploads get their own HTTP status code
+            status_code = 413 if error == PDFValidationError.TOO_LARGE else 400
+            raise HTTPException(status_code=status_code, detail=pdf_service.validation_message(error, file))
 
         # Store file
         file_id, file_path = pdf_service.store_file(file)
 
+        # Get actual size without re-reading the upload
+        file.file.seek(0, os.SEEK_END)
+        size_bytes = file.file.tell()
+        file.file.seek(0)
+
         # Save file record to database
         uploaded_file = UploadedFileDB(
             id=file_id,
             filename=file.filename or "uploaded.pdf",
             mime_type=file.content_type or "application/pdf",
-            size_bytes=len(file.file.read()),
+            size_bytes=size_bytes,
             file_path=file_path
         )
 
-        # Reset file pointer and get actual size
-        file.file.seek(0)
-        content = file.file.read()
-        uploaded_file.size_bytes = len(content)
-
         db.add(uploaded_file)
         db.commit()
         db.refresh(uploaded_file)
@@ -12,18 +12,20 @@ class JobStatus(str, Enum):
     FAILED = "Failed"
 
 
+class AddNodeRequest(BaseModel):
+    node_type: NodeType
+    config: dict
+
+
 class CreateWorkflowRequest(BaseModel):
     name: str
+    nodes: List[AddNodeRequest] = []
 
 
 class CreateWorkflowResponse(BaseModel):
     id: str
     name: str
-
-
-class AddNodeRequest(BaseModel):
-    node_type: NodeType
-    config: dict
+    node_ids: List[str] = []
 
 
 class WorkflowDetailResponse(BaseModel):
@@ -127,6 +129,10 @@ class AddEdgeRequest(BaseModel):
     condition: Optional[str] = None
 
 
+class AddEdgesRequest(BaseModel):
+    edges: List[AddEdgeRequest]
+
+
 class EdgeResponse(BaseModel):
     id: str
     workflow_id: str
@@ -1,4 +1,4 @@
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import time
 import asyncio
 from ..services.llm_service import llm_service
@@ -6,11 +6,51 @@ from ..services.pdf_service import pdf_service
 from ..services.formatter_service import formatter_service
 
 
+# Tools an agent may call; a frozenset so membership checks are hashed, built once at import
+VALID_TOOLS = frozenset(("pdf_extract", "formatter", "llm_call"))
+
+
+# LLM settings for the agent's planning and llm_call tool calls (call_llm only reads this)
+AGENT_LLM_CONFIG = {"model": "gpt-4o-mini", "prompt": "{text}"}
+
+
+# Sleep used between LLM retries; a module attribute so tests can replace it without patching asyncio
+_backoff_sleep = asyncio.sleep
+
+
 class AgentConfigError(Exception):
     """Raised when agent configuration is invalid"""
     pass
 
 
+def _check_tools(tools: Any) -> Optional[str]:
+    if not isinstance(tools, list) or len(tools) == 0:
+        return "Agent tools must be a non-empty list"
+    for tool in tools:
+        if not isinstance(tool, str) or tool not in VALID_TOOLS:
+            return f"Invalid tool '{tool}'. Valid tools: {', '.join(sorted(VALID_TOOLS))}"
+    return None
+
+
+# (field, required, check) in validation order; check returns an error message, or None if the value is valid.
+# Optional fields fall back to in-range defaults (max_concurrent=1, timeout_seconds=30, max_retries=3).
+_CONFIG_SCHEMA = (
+    ("objective", True, None),
+    ("tools", True, _check_tools),
+    ("budgets", True,
+     lambda v: None if isinstance(v, dict) else "Agent budgets must be a dictionary"),
+    ("max_concurrent", False,
+     lambda v: "max_concurrent must be an integer between 1 and 10"
+     if not isinstance(v, int) or v < 1 or v > 10 else None),
+    ("timeout_seconds", False,
+     lambda v: "timeout_seconds must be a number between 0 and 30"
+     if not isinstance(v, (int, float)) or v <= 0 or v > 30 else None),
+    ("max_retries", False,
+     lambda v: "max_retries must be an integer between 0 and 3"
+     if not isinstance(v, int) or v < 0 or v > 3 else None),
+)
+
+
 def validate_config(config: Dict[str, Any]) -> Tuple[bool, str]:
     """
     Validate agent configuration according to policy limits.
@@ -21,51 +61,38 @@ def validate_config(config: Dict[str, Any]) -> Tuple[bool, str]:
     Returns:
         Tuple[bool, str]: (is_valid, error_message)
     """
-    try:
-        # Required fields
-        if "objective" not in config:
-            return False, "Agent config missing required field: objective"
-
-        if "tools" not in config:
-            return False, "Agent config missing required field: tools"
-
-        # Tools whitelist validation
-        tools = config["tools"]
-        if not isinstance(tools, list) or len(tools) == 0:
-            return False, "Agent tools must be a non-empty list"
-
-        valid_tools = {"pdf_extract", "formatter", "llm_call"}
-        for tool in tools:
-            if tool not in valid_tools:
-                return False, f"Invalid tool '{tool}'. Valid tools: {valid_tools}"
+    if not isinstance(config, dict):
+        return False, "Agent config validation error: config must be a dictionary"
 
-        # Budgets validation when tools are used
-        if "budgets" not in config:
-            return False, "Agent config missing required field: budgets"
+    for field, required, check in _CONFIG_SCHEMA:
+        if field not in config:
+            if required:
+                return False, f"Agent config missing required field: {field}"
+            continue
 
-        budgets = config["budgets"]
-        if not isinstance(budgets, dict):
-            return False, "Agent budgets must be a dictionary"
+        error = check(config[field]) if check else None
+        if error:
+            return False, error
 
-        # Concurrency limits
-        max_concurrent = config.get("max_concurrent", 1)
-        if not isinstance(max_concurrent, int) or max_concurrent < 1 or max_concurrent > 10:
-            return False, "max_concurrent must be an integer between 1 and 10"
+    return True, ""
 
-        # Timeout limits
-        timeout_seconds = config.get("timeout_seconds", 30)
-        if not isinstance(timeout_seconds, (int, float)) or timeout_seconds <= 0 or timeout_seconds > 30:
-            return False, "timeout_seconds must be a number between 0 and 30"
 
-        # Retry limits
-        max_retries = config.get("max_retries", 3)
-        if not isinstance(max_retries, int) or max_retries < 0 or max_retries > 3:
-            return False, "max_retries must be an integer between 0 and 3"
-
-        return True, ""
+async def _call_llm_with_retry(prompt: str, timeout: float, max_retries: int = 0) -> str:
+    """
+    Call the LLM with a per-attempt timeout, retrying timeouts with exponential backoff.
 
-    except Exception as e:
-        return False, f"Agent config validation error: {str(e)}"
+    Raises:
+        asyncio.TimeoutError: If every attempt timed out
+    """
+    for retry in range(max_retries + 1):
+        try:
+            # asyncio.timeout runs the call in the current task, unlike wait_for which wraps it in a new one
+            async with asyncio.timeout(timeout):
+                return await llm_service.call_llm(prompt, AGENT_LLM_CONFIG)
+        except asyncio.TimeoutError:
+            if retry == max_retries:
+                raise
+            await _backoff_sleep(min(0.05 * 2 ** retry, 0.5))  # Capped exponential backoff
 
 
 async def execute_agent_bounded(config: Dict[str, Any], input_text: str) -> Dict[str, Any]:
@@ -87,6 +114,8 @@ async def execute_agent_bounded(config: Dict[str, Any], input_text: str) -> Dict
     max_concurrent = config.get("max_concurrent", 1)
     timeout_seconds = config.get("timeout_seconds", 30)
     max_retries = config.get("max_retries", 3)
+    formatter_config = {"rules": config.get("formatting_rules", ["lowercase"])}
+    format_text = formatter_service.format_text
 
     current_text = input_text
     iterations = 0
@@ -95,7 +124,6 @@ async def execute_agent_bounded(config: Dict[str, Any], input_text: str) -> Dict
     try:
         for iteration in range(max_iterations):
             iterations += 1
-            iteration_start = time.time()
 
             # Check timeout
             elapsed = time.time() - start_time
@@ -119,25 +147,19 @@ async def execute_agent_bounded(config: Dict[str, Any], input_text: str) -> Dict
             """
 
             # Call LLM to determine next action (with retry logic)
-            action = None
-            for retry in range(max_retries + 1):
-                try:
-                    action_response = await asyncio.wait_for(
-                        llm_service.call_llm(action_prompt, {"model": "gpt-4o-mini", "prompt": "{text}"}),
-                        timeout=min(timeout_seconds - elapsed, 10)
-                    )
-                    action = action_response.strip().lower()
-                    break
-                except asyncio.TimeoutError:
-                    if retry == max_retries:
-                        return {
-                            "output_text": current_text,
-                            "termination_reason": "llm_timeout",
-                            "iterations": iterations,
-                            "execution_time": time.time() - start_time,
-                            "execution_log": execution_log
-                        }
-                    await asyncio.sleep(2 ** retry)  # Exponential backoff
+            try:
+                action_response = await _call_llm_with_retry(
+                    action_prompt, timeout=min(timeout_seconds - elapsed, 10), max_retries=max_retries
+                )
+            except asyncio.TimeoutError:
+                return {
+                    "output_text": current_text,
+                    "termination_reason": "llm_timeout",
+                    "iterations": iterations,
+                    "execution_time": time.time() - start_time,
+                    "execution_log": execution_log
+                }
+            action = action_response.strip().lower()
 
             execution_log.append({
                 "iteration": iteration + 1,
@@ -160,18 +182,14 @@ async def execute_agent_bounded(config: Dict[str, Any], input_text: str) -> Dict
                 # Use LLM to process current text towards objective
                 llm_prompt = f"Objective: {objective}\n\nProcess this text: {current_text}"
                 try:
-                    current_text = await asyncio.wait_for(
-                        llm_service.call_llm(llm_prompt, {"model": "gpt-4o-mini", "prompt": "{text}"}),
-                        timeout=min(timeout_seconds - elapsed, 10)
-                    )
+                    current_text = await _call_llm_with_retry(llm_prompt, timeout=min(timeout_seconds - elapsed, 10))
                 except asyncio.TimeoutError:
                     execution_log.append({"error": "llm_timeout"})
                     continue
 
             elif action == "formatter" and "formatter" in tools:
                 # Apply formatting rules
-                formatting_rules = config.get("formatting_rules", ["lowercase"])
-                current_text = formatter_service.format_text(current_text, {"rules": formatting_rules})
+                current_text = format_text(current_text, formatter_config)
 
             elif action == "pdf_extract" and "pdf_extract" in tools:
                 # This would typically extract from a file_id in the text
@@ -1,20 +1,32 @@
 from typing import Dict, List, Any, Optional, Tuple
+from itertools import groupby
 from fastapi import HTTPException
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
+# Ordered for error messages; the frozenset is what membership checks use
+SUPPORTED_RULES = ("lowercase", "uppercase", "half_to_full", "full_to_half")
+_SUPPORTED_RULE_SET = frozenset(SUPPORTED_RULES)
+
+# Width conversion tables for str.translate: ASCII space <-> ideographic space (U+3000),
+# ASCII printable 0x21-0x7E <-> full-width forms U+FF01-U+FF5E
+_HALF_TO_FULL_TABLE = {0x20: 0x3000, **{code: code - 0x21 + 0xFF01 for code in range(0x21, 0x7F)}}
+_FULL_TO_HALF_TABLE = {full: half for half, full in _HALF_TO_FULL_TABLE.items()}
+
 class FormatterService:
     """Service for text formatting operations"""
 
     def __init__(self):
-        self.supported_rules = [
-            "lowercase",
-            "uppercase",
-            "half_to_full",
-            "full_to_half"
-        ]
+        self.supported_rules = list(SUPPORTED_RULES)
+        # Rule name -> handler, so applying a rule is one lookup instead of an if/elif chain
+        self._rule_handlers = {
+            "lowercase": self._apply_lowercase,
+            "uppercase": self._apply_uppercase,
+            "half_to_full": self._apply_half_to_full,
+            "full_to_half": self._apply_full_to_half,
+        }
 
     def validate_rules(self, rules: List[str]) -> Tuple[bool, Optional[str]]:
         """
@@ -31,7 +43,7 @@ class FormatterService:
 
             # Check all rules are supported
             for rule in rules:
-                if rule not in self.supported_rules:
+                if not isinstance(rule, str) or rule not in _SUPPORTED_RULE_SET:
                     return False, f"Unsupported rule: '{rule}'. Supported rules: {', '.join(self.supported_rules)}"
 
             return True, None
@@ -74,18 +86,20 @@ class FormatterService:
             if not is_valid:
                 raise HTTPException(status_code=400, detail=f"Invalid formatter rules: {error_msg}")
 
+            # Nothing to transform; invalid rules are still rejected above
+            if not text or not rules:
+                return text
+
             result = text
 
+            # Every supported rule is idempotent, so a run of the same rule needs only one pass.
+            # Different rules are never merged: e.g. lowercase then uppercase is not the same as
+            # uppercase alone for characters like U+212A KELVIN SIGN.
+            passes = [rule for rule, _ in groupby(rules)]
+
             # Apply rules in order
-            for rule in rules:
-                if rule == "lowercase":
-                    result = self._apply_lowercase(result)
-                elif rule == "uppercase":
-                    result = self._apply_uppercase(result)
-                elif rule == "half_to_full":
-                    result = self._apply_half_to_full(result)
-                elif rule == "full_to_half":
-                    result = self._apply_full_to_half(result)
+            for rule in passes:
+                result = self._rule_handlers[rule](result)
 
                 logger.debug(f"Applied rule '{rule}': {len(result)} characters")
 
@@ -108,35 +122,11 @@ class FormatterService:
 
     def _apply_half_to_full(self, text: str) -> str:
         """Convert half-width characters to full-width"""
-        # ASCII to full-width mapping
-        result = ""
-        for char in text:
-            code = ord(char)
-            # Convert ASCII space (0x20) to full-width space (0x3000)
-            if code == 0x20:
-                result += chr(0x3000)
-            # Convert ASCII printable characters (0x21-0x7E) to full-width (0xFF01-0xFF5E)
-            elif 0x21 <= code <= 0x7E:
-                result += chr(code - 0x21 + 0xFF01)
-            else:
-                result += char
-        return result
+        return text.translate(_HALF_TO_FULL_TABLE)
 
     def _apply_full_to_half(self, text: str) -> str:
         """Convert full-width characters to half-width"""
-        # Full-width to ASCII mapping
-        result = ""
-        for char in text:
-            code = ord(char)
-            # Convert full-width space (0x3000) to ASCII space (0x20)
-            if code == 0x3000:
-                result += chr(0x20)
-            # Convert full-width printable characters (0xFF01-0xFF5E) to ASCII (0x21-0x7E)
-            elif 0xFF01 <= code <= 0xFF5E:
-                result += chr(code - 0xFF01 + 0x21)
-            else:
-                result += char
-        return result
+        return text.translate(_FULL_TO_HALF_TABLE)
 
     def format_text(self, text: str, config: Dict[str, Any]) -> str:
         """
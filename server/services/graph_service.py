@@ -1,5 +1,5 @@
-from typing import List, Dict, Set, Iterator, Tuple
-from collections import defaultdict, deque
+from typing import List, Dict, Set, Iterator, Tuple, Optional
+from collections import defaultdict
 from ..db_models import EdgeDB, NodeDB
 
 
@@ -36,35 +36,60 @@ def validate_edges_no_cycles(workflow_id: str, edges: List[EdgeDB], nodes: List[
         if edge.to_node_id not in node_ids:
             raise InvalidNodeReferenceError(f"Edge references invalid to_node_id: {edge.to_node_id}")
 
-    # Build adjacency graph
-    graph = defaultdict(list)
+    successors, in_degree = _build_adjacency(edges, nodes)
+
+    # Kahn's algorithm: any node never reaching in-degree 0 sits on or behind a cycle
+    scheduled = sum(len(batch) for batch in _ready_batches(successors, in_degree))
+    if scheduled < len(in_degree):
+        raise CycleDetectionError(f"Cycle detected involving node: {_node_on_cycle(edges, in_degree)}")
+
+
+def _build_adjacency(edges: List[EdgeDB], nodes: List[NodeDB]) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
+    """Build successor lists and in-degree counts in a single pass over the edges"""
+    successors = defaultdict(list)
+    in_degree = defaultdict(int)
+    for node in nodes:
+        in_degree[node.id] = 0
+
     for edge in edges:
-        graph[edge.from_node_id].append(edge.to_node_id)
+        successors[edge.from_node_id].append(edge.to_node_id)
+        in_degree[edge.to_node_id] += 1
+
+    return successors, in_degree
 
-    # DFS-based cycle detection
-    white = set(node_ids)  # Not visited
-    gray = set()          # Currently being processed
-    black = set()         # Completely processed
 
-    def dfs(node_id: str) -> None:
-        if node_id in gray:
-            raise CycleDetectionError(f"Cycle detected involving node: {node_id}")
-        if node_id in black:
-            return
+def _ready_batches(successors: Dict[str, List[str]], in_degree: Dict[str, int]) -> Iterator[List[str]]:
+    """Yield successive batches of nodes whose dependencies are all done (decrements in_degree in place)"""
+    batch = [node_id for node_id, degree in in_degree.items() if degree == 0]
 
-        white.discard(node_id)
-        gray.add(node_id)
+    while batch:
+        yield batch
 
-        for neighbor in graph[node_id]:
-            dfs(neighbor)
+        next_batch = []
+        for node_id in batch:
+            for neighbor in successors.get(node_id, ()):
+                in_degree[neighbor] -= 1
+                if in_degree[neighbor] == 0:
+                    next_batch.append(neighbor)
+        batch = next_batch
 
-        gray.discard(node_id)
-        black.add(node_id)
 
-    # Check all nodes for cycles
-    for node_id in list(white):
-        if node_id in white:
-            dfs(node_id)
+def _node_on_cycle(edges: List[EdgeDB], in_degree: Dict[str, int]) -> str:
+    """Find a node on a cycle among the nodes Kahn's algorithm could not schedule"""
+    blocked = {node_id for node_id, degree in in_degree.items() if degree > 0}
+
+    # Every blocked node has a blocked predecessor, so walking predecessors must loop back
+    predecessor = {}
+    for edge in edges:
+        if edge.to_node_id in blocked and edge.from_node_id in blocked:
+            predecessor.setdefault(edge.to_node_id, edge.from_node_id)
+
+    node_id = min(blocked)
+    seen = set()
+    while node_id not in seen:
+        seen.add(node_id)
+        node_id = predecessor[node_id]
+    return node_id
 
 
 def topo_schedule(edges: List[EdgeDB], nodes: List[NodeDB]) -> Iterator[List[str]]:
@@ -72,7 +97,8 @@ def topo_schedule(edges: List[EdgeDB], nodes: List[NodeDB]) -> Iterator[List[str
     Generate topological schedule for DAG execution with AND-join semantics.
 
     Returns an iterator of node batches that can be executed in parallel.
-    Each batch contains nodes that have no pending dependencies.
+    Each batch contains nodes that have no pending dependencies, sorted by node ID
+    so the schedule doesn't depend on node or edge order.
 
     Args:
         edges: List of edges defining dependencies
@@ -81,54 +107,42 @@ def topo_schedule(edges: List[EdgeDB], nodes: List[NodeDB]) -> Iterator[List[str
     Yields:
         List[str]: Batch of node IDs ready for execution
     """
-    # Build adjacency list and in-degree count
-    graph = defaultdict(list)
-    in_degree = defaultdict(int)
-    all_nodes = {node.id for node in nodes}
+    successors, in_degree = _build_adjacency(edges, nodes)
+    for batch in _ready_batches(successors, in_degree):
+        yield sorted(batch)
 
-    # Initialize in-degree for all nodes
-    for node_id in all_nodes:
-        in_degree[node_id] = 0
 
-    # Build graph and count in-degrees
-    for edge in edges:
-        graph[edge.from_node_id].append(edge.to_node_id)
-        in_degree[edge.to_node_id] += 1
-
-    # Find all nodes with no incoming edges (starting points)
-    queue = deque([node_id for node_id in all_nodes if in_degree[node_id] == 0])
-
-    while queue:
-        # Process all nodes ready in this batch
-        batch = []
-        batch_size = len(queue)
-
-        for _ in range(batch_size):
-            node_id = queue.popleft()
-            batch.append(node_id)
+def build_predecessor_index(edges: List[EdgeDB]) -> Dict[str, List[str]]:
+    """
+    Map each node to its direct dependencies (incoming nodes) in one pass over the edges.
 
-            # Reduce in-degree for all neighbors
-            for neighbor in graph[node_id]:
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
+    Args:
+        edges: List of edges
 
-        if batch:
-            yield batch
+    Returns:
+        Dict[str, List[str]]: node_id -> upstream node IDs, in edge order
+    """
+    predecessors = defaultdict(list)
+    for edge in edges:
+        predecessors[edge.to_node_id].append(edge.from_node_id)
+    return dict(predecessors)
 
 
-def get_node_dependencies(node_id: str, edges: List[EdgeDB]) -> List[str]:
+def get_node_dependencies(node_id: str, edges: List[EdgeDB], index: Optional[Dict[str, List[str]]] = None) -> List[str]:
     """
     Get all direct dependencies (incoming nodes) for a given node.
 
     Args:
         node_id: The node to find dependencies for
         edges: List of edges
+        index: Optional prebuilt build_predecessor_index(edges), for callers looking up many nodes
 
     Returns:
         List[str]: List of node IDs that this node depends on
     """
-    return [edge.from_node_id for edge in edges if edge.to_node_id == node_id]
+    if index is None:
+        return [edge.from_node_id for edge in edges if edge.to_node_id == node_id]
+    return list(index.get(node_id, ()))
 
 
 def aggregate_inputs(node_dependencies: List[str], node_outputs: Dict[str, str]) -> str:
@@ -145,12 +159,6 @@ def aggregate_inputs(node_dependencies: List[str], node_outputs: Dict[str, str])
     if not node_dependencies:
         return ""
 
-    # Deterministic aggregation: join outputs with double newline
-    inputs = []
-    for dep_node_id in sorted(node_dependencies):  # Sort for determinism
-        if dep_node_id in node_outputs:
-            output = node_outputs[dep_node_id]
-            if output:
-                inputs.append(output)
-
-    return "\n\n".join(inputs)
\ No newline at end of file
+    # Deterministic aggregation: join outputs with double newline, skipping missing/empty ones
+    outputs = (node_outputs.get(dep_node_id) for dep_node_id in sorted(node_dependencies))
+    return "\n\n".join(output for output in outputs if output)
\ No newline at end of file
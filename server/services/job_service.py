@@ -10,11 +10,14 @@ from ..models import NodeType
 from .pdf_service import pdf_service
 from .llm_service import llm_service
 from .formatter_service import formatter_service
-from .graph_service import topo_schedule, get_node_dependencies, aggregate_inputs
+from .graph_service import topo_schedule, get_node_dependencies, aggregate_inputs, build_predecessor_index
 from .agent_service import execute_agent_bounded
 
 logger = logging.getLogger(__name__)
 
+TERMINAL_JOB_STATUSES = ("Succeeded", "Failed")
+
+
 class JobQueue:
     """Manages job queue with concurrency limits"""
 
@@ -82,6 +85,8 @@ class JobService:
 
     def __init__(self):
         self.job_queue = JobQueue()
+        self.completion_poll_interval = 0.1
+        self._completion_events: Dict[str, asyncio.Event] = {}  # job_id -> set when job finishes
 
     def create_job(self, db: Session, workflow_id: str) -> JobDB:
         """Create a new job record"""
@@ -112,9 +117,31 @@ class JobService:
         """Enqueue job for execution"""
         return self.job_queue.enqueue_job(workflow_id, job_id)
 
+    async def wait_for_completion(self, job_id: str, timeout: float) -> bool:
+        """
+        Wait until this process finishes running the job or timeout elapses
+        Jobs without a completion event (not started yet, or run by another process)
+        fall back to a short sleep so callers can re-check the database
+        Returns: True if the completion event fired
+        """
+        event = self._completion_events.get(job_id)
+        if event is None:
+            await asyncio.sleep(min(timeout, self.completion_poll_interval))
+            return False
+        try:
+            async with asyncio.timeout(timeout):
+                await event.wait()
+        except TimeoutError:
+            return False
+        return True
+
     async def execute_job(self, db: Session, job_id: str):
         """Execute a job asynchronously"""
         try:
+            # Created here, inside the try whose finally pops it, so jobs that are
+            # never executed never leave an event behind
+            self._completion_events.setdefault(job_id, asyncio.Event())
+
             # Get job and workflow
             job = db.query(JobDB).filter(JobDB.id == job_id).first()
             if not job:
@@ -170,6 +197,11 @@ class JobService:
             logger.error(f"Error executing job {job_id}: {str(e)}")
 
         finally:
+            # Wake up any long-polling status requests
+            event = self._completion_events.pop(job_id, None)
+            if event is not None:
+                event.set()
+
             # Notify queue that job is completed
             try:
                 next_job_id = self.job_queue.job_completed(job.workflow_id, job_id)
@@ -191,6 +223,7 @@ class JobService:
         # Create node lookup
         node_map = {node.id: node for node in nodes}
         node_outputs = {}  # node_id -> output_text
+        predecessors = build_predecessor_index(edges)  # One pass instead of an edge scan per node
 
         # Use topological scheduling to get execution batches
         for batch in topo_schedule(edges, nodes):
@@ -200,7 +233,7 @@ class JobService:
                 node = node_map[node_id]
 
                 # Get dependencies and aggregate inputs
-                dependencies = get_node_dependencies(node_id, edges)
+                dependencies = get_node_dependencies(node_id, edges, index=predecessors)
                 input_text = aggregate_inputs(dependencies, node_outputs)
 
                 # If no dependencies, use default starting text
@@ -283,8 +316,13 @@ class JobService:
                     if not uploaded_file:
                         raise ValueError(f"File {file_id} not found in database")
 
-                    # Extract text from the file
-                    extracted_text = pdf_service.extract_text(uploaded_file.file_path)
+                    # Extract text from the file; parsing is CPU-bound, so keep it off the event loop.
+                    # A PDFExtractionTimeout fails the step with the page that timed out.
+                    extracted_text = await asyncio.to_thread(
+                        pdf_service.extract_text,
+                        uploaded_file.file_path,
+                        max_pages=config.get("max_pages")
+                    )
                     return extracted_text
                 else:
                     # Fallback when no db session available
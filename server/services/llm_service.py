@@ -5,9 +5,61 @@ from typing import Dict, Any, Optional, List, Tuple
 from fastapi import HTTPException
 import logging
 import json
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Ordered for error messages; the frozenset is what membership checks use
+SUPPORTED_MODELS = ("gpt-4.1-mini", "gpt-4o", "gpt-5")
+_SUPPORTED_MODEL_SET = frozenset(SUPPORTED_MODELS)
+
+# Optional numeric parameters: (field, accepted types, min, max, error message), checked in order
+_PARAMETER_RANGES = (
+    ("temperature", (int, float), 0.0, 2.0, "Temperature must be a number between 0.0 and 2.0"),
+    ("max_tokens", int, 1, 4096, "max_tokens must be an integer between 1 and 4096"),
+    ("top_p", (int, float), 0.0, 1.0, "top_p must be a number between 0.0 and 1.0"),
+)
+
+# Fields validate_config looks at; anything else in the config is ignored
+_VALIDATED_FIELDS = ("model", "prompt") + tuple(field for field, *_ in _PARAMETER_RANGES)
+_MISSING = object()
+
+
+def _validate_fields(model: Any, prompt: Any, *parameters: Any) -> Tuple[bool, Optional[str]]:
+    """Validate LLM config values in _VALIDATED_FIELDS order; absent fields are passed as _MISSING"""
+    try:
+        # Check required fields
+        if model is _MISSING:
+            return False, "Missing required field: 'model'"
+
+        if prompt is _MISSING:
+            return False, "Missing required field: 'prompt'"
+
+        # Validate model
+        if not isinstance(model, str) or model not in _SUPPORTED_MODEL_SET:
+            return False, f"Unsupported model: {model}. Supported models: {', '.join(SUPPORTED_MODELS)}"
+
+        # Validate prompt contains placeholder
+        if "{text}" not in prompt:
+            logger.debug("LLM validation - prompt missing {text} placeholder: %r", prompt)
+            return False, "Prompt must contain '{text}' placeholder for input text"
+
+        # Validate optional parameters
+        for value, (_, types, low, high, message) in zip(parameters, _PARAMETER_RANGES):
+            if value is not _MISSING:
+                if not isinstance(value, types) or value < low or value > high:
+                    return False, message
+
+        return True, None
+
+    except Exception as e:
+        logger.error(f"Error validating LLM config: {str(e)}")
+        return False, f"Error validating configuration: {str(e)}"
+
+
+# typed=True keeps 1, 1.0 and True apart (max_tokens=1.0 is invalid, max_tokens=1 is not)
+_validate_fields_cached = lru_cache(maxsize=512, typed=True)(_validate_fields)
+
 class LLMService:
     """Service for handling LLM API calls"""
 
@@ -15,58 +67,23 @@ class LLMService:
         self.api_base = os.getenv("LLM_API_BASE", "https://api.openai.com/v1")
         self.api_key = os.getenv("LLM_API_KEY")
         self.timeout = 60  # 60 seconds timeout
-        self.supported_models = [
-            "gpt-4.1-mini",
-            "gpt-4o",
-            "gpt-5"
-        ]
+        self.supported_models = list(SUPPORTED_MODELS)
 
     def validate_config(self, config: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         """
         Validate LLM node configuration
+        Results are cached by the validated fields, so repeated configs skip re-validation.
         Returns: (is_valid, error_message)
         """
-        try:
-            # Check required fields
-            if "model" not in config:
-                return False, "Missing required field: 'model'"
-
-            if "prompt" not in config:
-                return False, "Missing required field: 'prompt'"
-
-            # Validate model
-            model = config["model"]
-            if model not in self.supported_models:
-                return False, f"Unsupported model: {model}. Supported models: {', '.join(self.supported_models)}"
-
-            # Validate prompt contains placeholder
-            prompt = config["prompt"]
-            logger.info(f"LLM validation - received prompt: '{prompt}'")
-            logger.info(f"LLM validation - prompt contains {{text}}: {'{text}' in prompt}")
-            if "{text}" not in prompt:
-                return False, "Prompt must contain '{text}' placeholder for input text"
-
-            # Validate optional parameters
-            if "temperature" in config:
-                temp = config["temperature"]
-                if not isinstance(temp, (int, float)) or temp < 0.0 or temp > 2.0:
-                    return False, "Temperature must be a number between 0.0 and 2.0"
-
-            if "max_tokens" in config:
-                max_tokens = config["max_tokens"]
-                if not isinstance(max_tokens, int) or max_tokens < 1 or max_tokens > 4096:
-                    return False, "max_tokens must be an integer between 1 and 4096"
+        if not isinstance(config, dict):
+            return False, "Error validating configuration: config must be a dictionary"
 
-            if "top_p" in config:
-                top_p = config["top_p"]
-                if not isinstance(top_p, (int, float)) or top_p < 0.0 or top_p > 1.0:
-                    return False, "top_p must be a number between 0.0 and 1.0"
-
-            return True, None
-
-        except Exception as e:
-            logger.error(f"Error validating LLM config: {str(e)}")
-            return False, f"Error validating configuration: {str(e)}"
+        values = tuple(config.get(field, _MISSING) for field in _VALIDATED_FIELDS)
+        try:
+            return _validate_fields_cached(*values)
+        except TypeError:
+            # Unhashable values can't key the cache
+            return _validate_fields(*values)
 
     async def call_llm(self, input_text: str, config: Dict[str, Any]) -> str:
         """
@@ -1,12 +1,72 @@
+import io
+import multiprocessing
 import os
-import uuid
-from typing import Optional, Tuple
+import secrets
+import threading
+import weakref
+from collections import OrderedDict
+from enum import IntEnum
+from itertools import islice
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
 import pypdf
 from fastapi import UploadFile, HTTPException
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Page extraction runs in a forked worker: it inherits the parsed reader instead of
+# re-parsing the PDF, and unlike a thread it can be killed when a page hangs.
+_WORKER_CONTEXT = multiprocessing.get_context("fork")
+
+
+class PDFValidationError(IntEnum):
+    """Why validate_pdf rejected an upload"""
+    BAD_MIME = 1
+    EMPTY = 2
+    TOO_LARGE = 3
+    NO_HEADER = 4
+    ENCRYPTED = 5
+    NO_PAGES = 6
+    CORRUPTED = 7
+    UNREADABLE = 8
+
+
+# Client-facing text per error; formatted only when a rejection is reported
+_VALIDATION_MESSAGES = {
+    PDFValidationError.BAD_MIME: "Invalid file type. Expected PDF, got {content_type}",
+    PDFValidationError.EMPTY: "Empty file uploaded",
+    PDFValidationError.TOO_LARGE: "File too large. Maximum size: {max_size_mb:.1f}MB",
+    PDFValidationError.NO_HEADER: "File is not a valid PDF document",
+    PDFValidationError.ENCRYPTED: "Encrypted PDFs are not supported",
+    PDFValidationError.NO_PAGES: "PDF has no pages",
+    PDFValidationError.CORRUPTED: "PDF file is corrupted or invalid",
+    PDFValidationError.UNREADABLE: "Error validating file: {detail}",
+}
+
+
+class PDFExtractionTimeout(Exception):
+    """Raised when a page exceeds page_timeout_seconds; partial_text holds the text of the pages before it"""
+
+    def __init__(self, page_number: int, timeout_seconds: float, partial_text: str):
+        super().__init__(
+            f"Text extraction stopped at page {page_number}: timed out after {timeout_seconds}s"
+        )
+        self.page_number = page_number
+        self.timeout_seconds = timeout_seconds
+        self.partial_text = partial_text
+
+
+def _extract_pages(pages: List[pypdf.PageObject], conn) -> None:
+    """Worker process body: send (text, error) for each page, in order"""
+    for page in pages:
+        try:
+            # A page without a content stream has no text; skip the extractor
+            conn.send(("" if "/Contents" not in page else page.extract_text(), None))
+        except Exception as e:
+            conn.send((None, str(e)))
+    conn.close()
+
+
 class PDFService:
     """Service for handling PDF file operations"""
 
@@ -15,59 +75,116 @@ class PDFService:
         self.max_file_size = 10 * 1024 * 1024  # 10MB limit
         self.allowed_mime_types = ["application/pdf"]
 
+        # Parsed readers from validate_pdf, keyed by the upload's file object until
+        # store_file assigns a path, then kept in an LRU keyed by stored path so
+        # extract_text can skip re-parsing the xref table. Each reader holds its whole
+        # PDF in memory, so the cache is bounded by file bytes; readers aren't
+        # thread-safe, so extract_text takes one out while using it.
+        self.reader_cache_max_bytes = 16 * 1024 * 1024
+        self._validated_readers = weakref.WeakKeyDictionary()
+        self._reader_cache: "OrderedDict[str, Tuple[pypdf.PdfReader, int]]" = OrderedDict()
+        self._reader_cache_bytes = 0
+        self._reader_cache_lock = threading.Lock()
+
+        # Exception text behind an UNREADABLE result, per upload, until validation_message reports it
+        self._validation_details = weakref.WeakKeyDictionary()
+
+        # Per-page extraction deadline; pathological content streams can otherwise
+        # keep pypdf busy for minutes on a single page.
+        self.page_timeout_seconds = 5.0
+
         # Create upload directory if it doesn't exist
         os.makedirs(upload_dir, exist_ok=True)
 
-    def validate_pdf(self, file: UploadFile) -> Tuple[bool, Optional[str]]:
+    def validate_config(self, config: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         """
-        Validate uploaded PDF file
+        Validate extract_text node configuration
         Returns: (is_valid, error_message)
         """
+        if not isinstance(config, dict):
+            return False, "Error validating configuration: config must be a dictionary"
+
+        max_pages = config.get("max_pages")
+        # bool is an int subclass, but True isn't a page count
+        if max_pages is not None and (
+            not isinstance(max_pages, int) or isinstance(max_pages, bool) or max_pages < 1
+        ):
+            return False, "max_pages must be a positive integer"
+
+        return True, None
+
+    def validate_pdf(self, file: UploadFile) -> Tuple[bool, Optional[PDFValidationError]]:
+        """
+        Validate uploaded PDF file
+        Returns: (is_valid, error); see validation_message for the error's text
+        """
         try:
             # Check MIME type
             if file.content_type not in self.allowed_mime_types:
-                return False, f"Invalid file type. Expected PDF, got {file.content_type}"
+                return False, PDFValidationError.BAD_MIME
 
-            # Read file content for validation
-            file_content = file.file.read()
-            file.file.seek(0)  # Reset file pointer
+            # Starlette counts the bytes as it parses the form; otherwise measure without reading
+            file_size = getattr(file, "size", None)
+            if file_size is None:
+                file.file.seek(0, os.SEEK_END)
+                file_size = file.file.tell()
+                file.file.seek(0)  # Reset file pointer
 
-            # Check file size
-            if len(file_content) == 0:
-                return False, "Empty file uploaded"
+            if file_size == 0:
+                return False, PDFValidationError.EMPTY
 
-            if len(file_content) > self.max_file_size:
-                return False, f"FILE_TOO_LARGE:File too large. Maximum size: {self.max_file_size / (1024*1024):.1f}MB"
+            if file_size > self.max_file_size:
+                return False, PDFValidationError.TOO_LARGE
 
             # Check if it's actually a PDF by reading the header
-            if not file_content.startswith(b'%PDF-'):
-                return False, "File is not a valid PDF document"
+            header = file.file.read(5)
+            file.file.seek(0)
+            if header != b'%PDF-':
+                return False, PDFValidationError.NO_HEADER
+
+            # Read file content for parsing
+            file_content = file.file.read()
+            file.file.seek(0)
 
             # Try to parse PDF to ensure it's not corrupted
             try:
-                import io
                 pdf_reader = pypdf.PdfReader(io.BytesIO(file_content))
 
                 # Check if PDF is encrypted
                 if pdf_reader.is_encrypted:
-                    return False, "Encrypted PDFs are not supported"
+                    return False, PDFValidationError.ENCRYPTED
 
                 # Try to access first page to ensure PDF is readable
                 if len(pdf_reader.pages) == 0:
-                    return False, "PDF has no pages"
+                    return False, PDFValidationError.NO_PAGES
 
                 # Test that we can read the first page
                 _ = pdf_reader.pages[0]
 
+                with self._reader_cache_lock:
+                    self._validated_readers[file.file] = (pdf_reader, len(file_content))
+
             except Exception as e:
                 logger.warning(f"PDF validation failed: {str(e)}")
-                return False, "PDF file is corrupted or invalid"
+                return False, PDFValidationError.CORRUPTED
 
             return True, None
 
         except Exception as e:
             logger.error(f"Error validating PDF: {str(e)}")
-            return False, f"Error validating file: {str(e)}"
+            self._validation_details[file] = str(e)
+            return False, PDFValidationError.UNREADABLE
+
+    def validation_message(self, error: PDFValidationError, file: UploadFile) -> str:
+        """
+        Human-readable text for a validate_pdf error
+        Returns: message suitable for an HTTP error detail
+        """
+        return _VALIDATION_MESSAGES[error].format(
+            content_type=file.content_type,
+            max_size_mb=self.max_file_size / (1024 * 1024),
+            detail=self._validation_details.pop(file, "unknown error")
+        )
 
     def store_file(self, file: UploadFile) -> Tuple[str, str]:
         """
@@ -76,7 +193,7 @@ class PDFService:
         """
         try:
             # Generate unique file ID and path
-            file_id = str(uuid.uuid4())
+            file_id = secrets.token_hex(16)
             file_extension = os.path.splitext(file.filename or "file.pdf")[1] or ".pdf"
             filename = f"{file_id}{file_extension}"
             file_path = os.path.join(self.upload_dir, filename)
@@ -88,6 +205,11 @@ class PDFService:
             with open(file_path, "wb") as f:
                 f.write(file_content)
 
+            with self._reader_cache_lock:
+                validated = self._validated_readers.pop(file.file, None)
+            if validated is not None:
+                self._cache_reader(file_path, *validated)
+
             logger.info(f"File stored successfully: {file_path}")
             return file_id, file_path
 
@@ -95,51 +217,136 @@ class PDFService:
             logger.error(f"Error storing file: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error storing file: {str(e)}")
 
-    def extract_text(self, file_path: str) -> str:
+    def extract_text(self, source: Union[str, bytes, BinaryIO], max_pages: Optional[int] = None) -> str:
         """
-        Extract text content from PDF file
+        Extract text content from a PDF given as a stored file path, raw bytes or a binary stream
+        Only the first max_pages pages are read when max_pages is set
+        Raises PDFExtractionTimeout if a page exceeds page_timeout_seconds
         Returns: extracted text content
         """
+        # Only stored paths go through the reader cache; in-memory PDFs are parsed directly
+        file_path = source if isinstance(source, str) else None
+        label = file_path or "<in-memory PDF>"
         try:
-            if not os.path.exists(file_path):
-                raise HTTPException(status_code=404, detail="File not found")
-
-            with open(file_path, "rb") as file:
-                pdf_reader = pypdf.PdfReader(file)
-
-                if pdf_reader.is_encrypted:
-                    raise HTTPException(status_code=400, detail="Cannot extract text from encrypted PDF")
-
-                text_content = ""
-                for page_num, page in enumerate(pdf_reader.pages):
+            if file_path is not None:
+                cached = self._take_cached_reader(file_path)
+                if cached is not None:
                     try:
-                        text_content += page.extract_text() + "\n"
-                    except Exception as e:
-                        logger.warning(f"Failed to extract text from page {page_num}: {str(e)}")
-                        continue
-
-                if not text_content.strip():
-                    logger.warning(f"No text extracted from PDF: {file_path}")
-                    return "No text content found in PDF"
-
-                logger.info(f"Successfully extracted text from PDF: {len(text_content)} characters")
-                return text_content.strip()
-
-        except HTTPException:
+                        return self._extract_from_reader(cached[0], label, max_pages)
+                    finally:
+                        # Put it back for the next caller unless the file was deleted meanwhile
+                        if os.path.exists(file_path):
+                            self._cache_reader(file_path, *cached)
+
+                # pypdf seeks and reads the file as it needs objects; no in-memory copy
+                with open(file_path, "rb") as file:
+                    return self._extract_from_stream(file, label, max_pages)
+
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                source = io.BytesIO(source)
+            return self._extract_from_stream(source, label, max_pages)
+
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="File not found")
+        except (HTTPException, PDFExtractionTimeout):
             raise
         except Exception as e:
-            logger.error(f"Error extracting text from PDF {file_path}: {str(e)}")
+            logger.error(f"Error extracting text from PDF {label}: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error extracting text from PDF: {str(e)}")
 
+    def _extract_from_stream(self, stream: BinaryIO, label: str, max_pages: Optional[int]) -> str:
+        """Parse a PDF stream and extract its text"""
+        # Same header check as validate_pdf, so non-PDFs never reach the parser
+        start = stream.tell()
+        header = stream.read(5)
+        stream.seek(start)
+        if header != b'%PDF-':
+            raise HTTPException(status_code=400, detail="File is not a valid PDF document")
+
+        return self._extract_from_reader(pypdf.PdfReader(stream), label, max_pages)
+
+    def _extract_from_reader(self, pdf_reader: pypdf.PdfReader, label: str, max_pages: Optional[int]) -> str:
+        """Extract the text of a parsed PDF's first max_pages pages"""
+        if pdf_reader.is_encrypted:
+            raise HTTPException(status_code=400, detail="Cannot extract text from encrypted PDF")
+
+        page_texts, timed_out_page = self._extract_page_texts(
+            list(islice(pdf_reader.pages, max_pages)), label
+        )
+        text_content = "\n".join(page_texts)
+        if timed_out_page is not None:
+            raise PDFExtractionTimeout(timed_out_page + 1, self.page_timeout_seconds, text_content.strip())
+
+        if not text_content.strip():
+            logger.warning(f"No text extracted from PDF: {label}")
+            return "No text content found in PDF"
+
+        logger.info(f"Successfully extracted text from PDF: {len(text_content)} characters")
+        return text_content.strip()
+
+    def _extract_page_texts(self, pages: List[pypdf.PageObject], label: str) -> Tuple[List[str], Optional[int]]:
+        """
+        Extract page texts in a worker process, killing it if a page exceeds page_timeout_seconds
+        Returns: (texts of the pages read, index of the page that timed out or None)
+        """
+        # Pages without a content stream have no text; don't start a worker for them
+        if not any("/Contents" in page for page in pages):
+            return [""] * len(pages), None
+
+        receiver, sender = _WORKER_CONTEXT.Pipe(duplex=False)
+        worker = _WORKER_CONTEXT.Process(target=_extract_pages, args=(pages, sender), daemon=True)
+        worker.start()
+        sender.close()
+        try:
+            page_texts = []
+            for page_num in range(len(pages)):
+                if not receiver.poll(self.page_timeout_seconds):
+                    logger.warning(
+                        f"Text extraction from page {page_num} of {label} exceeded "
+                        f"{self.page_timeout_seconds}s; skipping remaining pages"
+                    )
+                    return page_texts, page_num
+                text, error = receiver.recv()
+                if error is not None:
+                    logger.warning(f"Failed to extract text from page {page_num}: {error}")
+                    continue
+                page_texts.append(text)
+            return page_texts, None
+        finally:
+            if worker.is_alive():
+                worker.kill()
+            worker.join()
+            receiver.close()
+
+    def _take_cached_reader(self, file_path: str) -> Optional[Tuple[pypdf.PdfReader, int]]:
+        """Remove and return a stored file's cached (reader, size), so no other caller shares it"""
+        with self._reader_cache_lock:
+            cached = self._reader_cache.pop(file_path, None)
+            if cached is not None:
+                self._reader_cache_bytes -= cached[1]
+            return cached
+
+    def _cache_reader(self, file_path: str, pdf_reader: pypdf.PdfReader, size: int) -> None:
+        """Add a reader as most recently used, evicting the oldest until reader_cache_max_bytes fits"""
+        if size > self.reader_cache_max_bytes:
+            return
+        with self._reader_cache_lock:
+            previous = self._reader_cache.pop(file_path, None)
+            if previous is not None:
+                self._reader_cache_bytes -= previous[1]
+            self._reader_cache[file_path] = (pdf_reader, size)
+            self._reader_cache_bytes += size
+            while self._reader_cache_bytes > self.reader_cache_max_bytes:
+                _, (_, evicted_size) = self._reader_cache.popitem(last=False)
+                self._reader_cache_bytes -= evicted_size
+
     def get_file_info(self, file_path: str) -> dict:
         """
         Get information about a stored file
         Returns: file information dict
         """
         try:
-            if not os.path.exists(file_path):
-                raise HTTPException(status_code=404, detail="File not found")
-
+            # Single stat call; a missing file surfaces as FileNotFoundError
             stat = os.stat(file_path)
             return {
                 "size_bytes": stat.st_size,
@@ -147,8 +354,8 @@ class PDFService:
                 "exists": True
             }
 
-        except HTTPException:
-            raise
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="File not found")
         except Exception as e:
             logger.error(f"Error getting file info for {file_path}: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error accessing file: {str(e)}")
@@ -158,13 +365,15 @@ class PDFService:
         Delete a stored file
         Returns: True if successful
         """
+        self._take_cached_reader(file_path)
+
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                logger.info(f"File deleted: {file_path}")
-                return True
-            return False
+            os.remove(file_path)
+            logger.info(f"File deleted: {file_path}")
+            return True
 
+        except FileNotFoundError:
+            return False
         except Exception as e:
             logger.error(f"Error deleting file {file_path}: {str(e)}")
             return False
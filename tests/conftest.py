@@ -0,0 +1,83 @@
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-perf-baseline",
+        action="store_true",
+        default=False,
+        help="Record performance timings as the new baseline instead of comparing against it",
+    )
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Single TestClient for the whole session; app startup/shutdown runs once"""
+    # Imported here rather than at module level so unit modules that never touch the
+    # app (e.g. ones gated with importorskip) can collect without its dependencies
+    from server.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture
+async def async_client():
+    """In-process async client for tests that issue independent requests concurrently"""
+    from server.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as ac:
+        yield ac
+
+
+@pytest.fixture
+def create_workflow_with_nodes(client):
+    """Create a workflow and its nodes in a single request, returns (workflow_id, node_ids)"""
+    def _create(name, nodes):
+        response = client.post("/workflows", json={"name": name, "nodes": nodes})
+        assert response.status_code == 200
+        data = response.json()
+        return data["id"], data["node_ids"]
+
+    return _create
+
+
+@pytest.fixture(scope="session")
+def run_workflow_with_nodes(client):
+    """Create (or reuse) a workflow with the given nodes and run it, returns (workflow_id, job_id)
+
+    Workflows are cached for the session by node config, so tests that run the same
+    nodes share one workflow instead of rebuilding it.
+    """
+    workflows = {}
+
+    def _run(name, nodes):
+        key = json.dumps(nodes, sort_keys=True)
+        if key not in workflows:
+            response = client.post("/workflows", json={"name": name, "nodes": nodes})
+            assert response.status_code == 200
+            workflows[key] = response.json()["id"]
+        workflow_id = workflows[key]
+
+        run_response = client.post(f"/workflows/{workflow_id}/run")
+        assert run_response.status_code == 200
+        return workflow_id, run_response.json()["job_id"]
+
+    return _run
+
+
+@pytest.fixture
+def wait_for_job(client):
+    """Long-poll a job until it finishes (or timeout elapses), returns the job data"""
+    def _wait(job_id, timeout=10):
+        response = client.get(f"/jobs/{job_id}", params={"wait": True, "timeout": timeout})
+        assert response.status_code == 200
+        return response.json()
+
+    return _wait
@@ -1,14 +1,7 @@
 import pytest
-from fastapi.testclient import TestClient
-from server.main import app
 import io
 
 
-@pytest.fixture
-def client():
-    return TestClient(app)
-
-
 def test_upload_pdf_file_contract(client):
     """Contract test for POST /files - PDF upload"""
     # Create a mock PDF file
@@ -1,11 +1,4 @@
 import pytest
-from fastapi.testclient import TestClient
-from server.main import app
-
-
-@pytest.fixture
-def client():
-    return TestClient(app)
 
 
 def test_get_job_contract(client):
@@ -48,6 +41,34 @@ def test_get_job_contract(client):
             assert isinstance(data[field], str)
 
 
+def test_get_job_long_poll_contract(client):
+    """Contract test for GET /jobs/{job_id}?wait=true - returns once the job is finished"""
+    create_response = client.post("/workflows", json={"name": "Test Workflow"})
+    workflow_id = create_response.json()["id"]
+
+    client.post(f"/workflows/{workflow_id}/nodes", json={
+        "node_type": "formatter",
+        "config": {"rules": ["uppercase"]}
+    })
+
+    run_response = client.post(f"/workflows/{workflow_id}/run")
+    job_id = run_response.json()["job_id"]
+
+    response = client.get(f"/jobs/{job_id}", params={"wait": True, "timeout": 10})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == job_id
+    assert data["status"] in ["Succeeded", "Failed"]
+    assert data["finished_at"] is not None
+
+
+def test_get_job_long_poll_invalid_timeout_contract(client):
+    """Contract test for GET /jobs/{job_id}?wait=true - timeout outside allowed range"""
+    response = client.get("/jobs/some-job-id", params={"wait": True, "timeout": 3600})
+    assert response.status_code == 422
+
+
 def test_get_nonexistent_job_contract(client):
     """Contract test for GET /jobs/{job_id} - job not found"""
     response = client.get("/jobs/nonexistent-job-id")
@@ -1,11 +1,4 @@
 import pytest
-from fastapi.testclient import TestClient
-from server.main import app
-
-
-@pytest.fixture
-def client():
-    return TestClient(app)
 
 
 def test_get_edges_contract(client):
@@ -1,11 +1,4 @@
 import pytest
-from fastapi.testclient import TestClient
-from server.main import app
-
-
-@pytest.fixture
-def client():
-    return TestClient(app)
 
 
 def test_add_edge_contract(client):
@@ -104,4 +97,53 @@ def test_add_edge_to_nonexistent_workflow_contract(client):
     }
 
     response = client.post("/workflows/nonexistent-id/edges", json=edge_data)
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+def test_add_edges_bulk_contract(client):
+    """Contract test for POST /workflows/{id}/edges/bulk"""
+    create_response = client.post("/workflows", json={"name": "Test Bulk Edges", "nodes": [
+        {"node_type": "formatter", "config": {"rules": ["lowercase"]}},
+        {"node_type": "formatter", "config": {"rules": ["uppercase"]}},
+        {"node_type": "formatter", "config": {"rules": ["lowercase"]}}
+    ]})
+    create_data = create_response.json()
+    workflow_id = create_data["id"]
+    node1_id, node2_id, node3_id = create_data["node_ids"]
+
+    edges_data = {"edges": [
+        {"from_node_id": node1_id, "to_node_id": node2_id},
+        {"from_node_id": node2_id, "to_node_id": node3_id}
+    ]}
+    response = client.post(f"/workflows/{workflow_id}/edges/bulk", json=edges_data)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert "message" in data
+    assert isinstance(data["edge_ids"], list)
+    assert len(data["edge_ids"]) == 2
+
+    edges_response = client.get(f"/workflows/{workflow_id}/edges")
+    assert {edge["id"] for edge in edges_response.json()["edges"]} == set(data["edge_ids"])
+
+
+def test_add_edges_bulk_cycle_rejected_atomically_contract(client):
+    """Contract test for POST /workflows/{id}/edges/bulk - a cycle rejects the whole batch"""
+    create_response = client.post("/workflows", json={"name": "Test Bulk Cycle", "nodes": [
+        {"node_type": "formatter", "config": {"rules": ["lowercase"]}},
+        {"node_type": "formatter", "config": {"rules": ["uppercase"]}}
+    ]})
+    create_data = create_response.json()
+    workflow_id = create_data["id"]
+    node1_id, node2_id = create_data["node_ids"]
+
+    edges_data = {"edges": [
+        {"from_node_id": node1_id, "to_node_id": node2_id},
+        {"from_node_id": node2_id, "to_node_id": node1_id}
+    ]}
+    response = client.post(f"/workflows/{workflow_id}/edges/bulk", json=edges_data)
+
+    assert response.status_code == 400
+    assert "cycle" in response.json()["detail"].lower()
+
+    edges_response = client.get(f"/workflows/{workflow_id}/edges")
+    assert edges_response.json()["edges"] == []
@@ -1,11 +1,4 @@
 import pytest
-from fastapi.testclient import TestClient
-from server.main import app
-
-
-@pytest.fixture
-def client():
-    return TestClient(app)
 
 
 def test_add_node_contract(client):
@@ -40,4 +33,33 @@ def test_add_node_to_nonexistent_workflow_contract(client):
     }
 
     response = client.post("/workflows/nonexistent-id/nodes", json=node_data)
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+@pytest.mark.parametrize("max_pages", [0, -1, 1.5, "3", True])
+def test_add_extract_text_node_rejects_invalid_max_pages_contract(client, max_pages):
+    """Contract test for POST /workflows/{id}/nodes - max_pages must be a positive integer"""
+    create_response = client.post("/workflows", json={"name": "Test Workflow"})
+    workflow_id = create_response.json()["id"]
+
+    node_data = {
+        "node_type": "extract_text",
+        "config": {"file_id": "some-file", "max_pages": max_pages}
+    }
+
+    response = client.post(f"/workflows/{workflow_id}/nodes", json=node_data)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "max_pages must be a positive integer"
+
+
+def test_add_extract_text_node_accepts_max_pages_contract(client):
+    """Contract test for POST /workflows/{id}/nodes - a positive max_pages is accepted"""
+    create_response = client.post("/workflows", json={"name": "Test Workflow"})
+    workflow_id = create_response.json()["id"]
+
+    node_data = {
+        "node_type": "extract_text",
+        "config": {"file_id": "some-file", "max_pages": 3}
+    }
+
+    response = client.post(f"/workflows/{workflow_id}/nodes", json=node_data)
+    assert response.status_code == 200
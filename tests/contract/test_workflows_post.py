@@ -1,11 +1,4 @@
 import pytest
-from fastapi.testclient import TestClient
-from server.main import app
-
-
-@pytest.fixture
-def client():
-    return TestClient(app)
 
 
 def test_create_workflow_contract(client):
@@ -22,4 +15,39 @@ def test_create_workflow_contract(client):
     assert "name" in data
     assert data["name"] == "Test Workflow"
     assert isinstance(data["id"], str)
-    assert len(data["id"]) > 0  # UUID should be non-empty string
\ No newline at end of file
+    assert len(data["id"]) > 0  # UUID should be non-empty string
+
+def test_create_workflow_with_nodes_contract(client):
+    """Contract test for POST /workflows - initial nodes created in one request"""
+    request_data = {
+        "name": "Test Workflow",
+        "nodes": [
+            {"node_type": "extract_text", "config": {}},
+            {"node_type": "formatter", "config": {"rules": ["lowercase"]}}
+        ]
+    }
+
+    response = client.post("/workflows", json=request_data)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert isinstance(data["node_ids"], list)
+    assert len(data["node_ids"]) == 2
+
+    # Nodes keep the order they were given in
+    workflow_response = client.get(f"/workflows/{data['id']}")
+    nodes = workflow_response.json()["nodes"]
+    assert [node["id"] for node in nodes] == data["node_ids"]
+    assert [node["node_type"] for node in nodes] == ["extract_text", "formatter"]
+
+
+def test_create_workflow_with_invalid_node_contract(client):
+    """Contract test for POST /workflows - invalid initial node config is rejected"""
+    request_data = {
+        "name": "Test Workflow",
+        "nodes": [{"node_type": "formatter", "config": {"rules": ["invalid_rule"]}}]
+    }
+
+    response = client.post("/workflows", json=request_data)
+    assert response.status_code == 400
+    assert "detail" in response.json()
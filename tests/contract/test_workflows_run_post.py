@@ -1,28 +1,19 @@
 import pytest
-from fastapi.testclient import TestClient
-from server.main import app
+from pydantic import BaseModel, Extra, StrictStr
 
 
-@pytest.fixture
-def client():
-    return TestClient(app)
+class RunAcceptedSchema(BaseModel, extra=Extra.forbid):
+    """Async run response: only a job_id, no final_output"""
+    job_id: StrictStr
 
 
-def test_run_workflow_contract(client):
+def test_run_workflow_contract(client, create_workflow_with_nodes):
     """Contract test for POST /workflows/{id}/run - ASYNC VERSION"""
-    # First create a workflow
-    create_response = client.post("/workflows", json={"name": "Test Workflow"})
-    workflow_id = create_response.json()["id"]
-
-    # Add nodes to the workflow
-    client.post(f"/workflows/{workflow_id}/nodes", json={
-        "node_type": "extract_text",
-        "config": {}
-    })
-    client.post(f"/workflows/{workflow_id}/nodes", json={
-        "node_type": "formatter",
-        "config": {}
-    })
+    # Create a workflow with its nodes in one request
+    workflow_id, _ = create_workflow_with_nodes("Test Workflow", [
+        {"node_type": "extract_text", "config": {}},
+        {"node_type": "formatter", "config": {"rules": []}},
+    ])
 
     # Test running the workflow - NOW ASYNC
     response = client.post(f"/workflows/{workflow_id}/run")
@@ -31,10 +22,8 @@ def test_run_workflow_contract(client):
     data = response.json()
 
     # Verify response schema matches OpenAPI spec for ASYNC execution
-    assert "job_id" in data
-    assert isinstance(data["job_id"], str)
-    # Should NOT have final_output anymore since it's async
-    assert "final_output" not in data
+    # (job_id is a string; final_output is rejected as an extra field since it's async)
+    RunAcceptedSchema.parse_obj(data)
 
 
 def test_run_nonexistent_workflow_contract(client):
@@ -1,11 +1,22 @@
+from typing import List, Literal, Optional
+
 import pytest
-from fastapi.testclient import TestClient
-from server.main import app
+from pydantic import BaseModel, StrictStr
+
+
+class RunSchema(BaseModel):
+    id: StrictStr
+    workflow_id: StrictStr
+    status: Literal["Pending", "Running", "Succeeded", "Failed"]
+    started_at: StrictStr
+    job_id: Optional[StrictStr] = None
+    finished_at: Optional[StrictStr] = None
+    error_message: Optional[StrictStr] = None
+    final_output: Optional[StrictStr] = None
 
 
-@pytest.fixture
-def client():
-    return TestClient(app)
+class WorkflowRunsSchema(BaseModel):
+    runs: List[RunSchema]
 
 
 def test_get_workflow_runs_contract(client):
@@ -30,30 +41,10 @@ def test_get_workflow_runs_contract(client):
     data = response.json()
 
     # Verify response schema matches OpenAPI spec
-    assert "runs" in data
-    assert isinstance(data["runs"], list)
-
-    if len(data["runs"]) > 0:
-        run = data["runs"][0]
-        assert "id" in run
-        assert "workflow_id" in run
-        assert "status" in run
-        assert "started_at" in run
-        assert run["workflow_id"] == workflow_id
-        assert run["status"] in ["Pending", "Running", "Succeeded", "Failed"]
-
-        # For async jobs, we expect job_id field
-        if "job_id" in run:
-            assert isinstance(run["job_id"], str)
-
-        # Optional fields
-        if "finished_at" in run:
-            assert run["finished_at"] is None or isinstance(run["finished_at"], str)
-        if "error_message" in run:
-            assert run["error_message"] is None or isinstance(run["error_message"], str)
-        if "final_output" in run:
-            assert run["final_output"] is None or isinstance(run["final_output"], str)
+    runs = WorkflowRunsSchema.parse_obj(data).runs
 
+    if len(runs) > 0:
+        assert runs[0].workflow_id == workflow_id
 
 def test_get_runs_for_nonexistent_workflow_contract(client):
     """Contract test for GET /workflows/{id}/runs - workflow not found"""
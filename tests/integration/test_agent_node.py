@@ -1,22 +1,18 @@
+import logging
+from datetime import datetime
+
 import pytest
-import time
-from fastapi.testclient import TestClient
-from server.main import app
 
+logger = logging.getLogger(__name__)
 
-@pytest.fixture
-def client():
-    return TestClient(app)
+# Slack on top of the agent's own timeout_seconds before the long-poll gives up
+POLL_TIMEOUT_BUFFER = 5
 
 
-def test_agent_node_bounded_execution(client):
+@pytest.mark.asyncio
+async def test_agent_node_bounded_execution(async_client):
     """Integration test for Agent node with bounded loop execution"""
-    # Create workflow
-    create_response = client.post("/workflows", json={"name": "Agent Bounded Test"})
-    assert create_response.status_code == 200
-    workflow_id = create_response.json()["id"]
-
-    # Add agent node with bounded configuration
+    # Create workflow with an agent node using bounded configuration
     agent_data = {
         "node_type": "agent",
         "config": {
@@ -31,36 +27,29 @@ def test_agent_node_bounded_execution(client):
         }
     }
 
-    agent_response = client.post(f"/workflows/{workflow_id}/nodes", json=agent_data)
-    assert agent_response.status_code == 200
-    agent_node_id = agent_response.json()["node_id"]
+    create_response = await async_client.post("/workflows", json={"name": "Agent Bounded Test", "nodes": [agent_data]})
+    assert create_response.status_code == 200
+    create_data = create_response.json()
+    workflow_id = create_data["id"]
+    (agent_node_id,) = create_data["node_ids"]
 
     # Run the workflow
-    run_response = client.post(f"/workflows/{workflow_id}/run")
+    run_response = await async_client.post(f"/workflows/{workflow_id}/run")
     assert run_response.status_code == 200
     job_id = run_response.json()["job_id"]
 
-    # Poll for completion with timeout
-    max_polls = 40  # Agent might take longer
-    job_status = None
-    job_data = None
-
-    for i in range(max_polls):
-        job_response = client.get(f"/jobs/{job_id}")
-        assert job_response.status_code == 200
-        job_data = job_response.json()
-        job_status = job_data["status"]
-
-        if job_status in ["Succeeded", "Failed"]:
-            break
-
-        time.sleep(1)
+    # Long-poll for completion, bounded by the agent's configured timeout
+    poll_timeout = agent_data["config"]["timeout_seconds"] + POLL_TIMEOUT_BUFFER
+    job_response = await async_client.get(f"/jobs/{job_id}", params={"wait": True, "timeout": poll_timeout})
+    assert job_response.status_code == 200
+    job_data = job_response.json()
+    job_status = job_data["status"]
 
     # Verify job completed (either succeeded or failed deterministically)
     assert job_status in ["Succeeded", "Failed"], f"Job did not complete. Status: {job_status}"
 
     # Get job details to verify agent execution
-    details_response = client.get(f"/jobs/{job_id}/details")
+    details_response = await async_client.get(f"/jobs/{job_id}/details")
     assert details_response.status_code == 200
     job_details = details_response.json()
 
@@ -79,9 +68,8 @@ def test_agent_node_bounded_execution(client):
     assert finished_at is not None
 
     # Parse timestamps and verify bounded execution
-    from datetime import datetime
-    start_time = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
-    end_time = datetime.fromisoformat(finished_at.replace('Z', '+00:00'))
+    start_time = datetime.fromisoformat(started_at)
+    end_time = datetime.fromisoformat(finished_at)
     execution_duration = (end_time - start_time).total_seconds()
 
     # Should complete within the timeout limit (25s + some buffer)
@@ -91,12 +79,12 @@ def test_agent_node_bounded_execution(client):
     if agent_step["status"] == "Succeeded":
         assert agent_step["output_text"] is not None
         assert len(agent_step["output_text"]) > 0
-        print(f"✅ Agent succeeded with output: {agent_step['output_text'][:100]}...")
+        logger.debug("Agent succeeded with output: %.100s...", agent_step["output_text"])
     else:
         assert agent_step["error_message"] is not None
-        print(f"✅ Agent failed deterministically: {agent_step['error_message']}")
+        logger.debug("Agent failed deterministically: %s", agent_step["error_message"])
 
-    print(f"Agent execution duration: {execution_duration:.2f}s")
+    logger.debug("Agent execution duration: %.2fs", execution_duration)
 
 
 def test_agent_node_tools_whitelist_enforcement(client):
@@ -129,22 +117,16 @@ def test_agent_node_tools_whitelist_enforcement(client):
     assert run_response.status_code == 200
     job_id = run_response.json()["job_id"]
 
-    # Poll for completion
-    max_polls = 20
-    for i in range(max_polls):
-        job_response = client.get(f"/jobs/{job_id}")
-        assert job_response.status_code == 200
-        job_data = job_response.json()
-
-        if job_data["status"] in ["Succeeded", "Failed"]:
-            break
-
-        time.sleep(1)
+    # Long-poll for completion, bounded by the agent's configured timeout
+    poll_timeout = agent_data["config"]["timeout_seconds"] + POLL_TIMEOUT_BUFFER
+    job_response = client.get(f"/jobs/{job_id}", params={"wait": True, "timeout": poll_timeout})
+    assert job_response.status_code == 200
+    job_data = job_response.json()
 
     # Should complete (might succeed or fail, but should be deterministic)
     assert job_data["status"] in ["Succeeded", "Failed"]
 
-    print(f"✅ Agent tools whitelist test completed with status: {job_data['status']}")
+    logger.debug("Agent tools whitelist test completed with status: %s", job_data["status"])
 
 
 def test_agent_node_budget_limits(client):
@@ -177,17 +159,11 @@ def test_agent_node_budget_limits(client):
     assert run_response.status_code == 200
     job_id = run_response.json()["job_id"]
 
-    # Poll for quick completion
-    max_polls = 15
-    for i in range(max_polls):
-        job_response = client.get(f"/jobs/{job_id}")
-        assert job_response.status_code == 200
-        job_data = job_response.json()
-
-        if job_data["status"] in ["Succeeded", "Failed"]:
-            break
-
-        time.sleep(1)
+    # Long-poll for quick completion, bounded by the agent's configured timeout
+    poll_timeout = agent_data["config"]["timeout_seconds"] + POLL_TIMEOUT_BUFFER
+    job_response = client.get(f"/jobs/{job_id}", params={"wait": True, "timeout": poll_timeout})
+    assert job_response.status_code == 200
+    job_data = job_response.json()
 
     # Should complete within budget
     assert job_data["status"] in ["Succeeded", "Failed"]
@@ -204,13 +180,12 @@ def test_agent_node_budget_limits(client):
     finished_at = agent_step["finished_at"]
 
     if started_at and finished_at:
-        from datetime import datetime
-        start_time = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
-        end_time = datetime.fromisoformat(finished_at.replace('Z', '+00:00'))
+        start_time = datetime.fromisoformat(started_at)
+        end_time = datetime.fromisoformat(finished_at)
         execution_duration = (end_time - start_time).total_seconds()
 
         # Should respect budget limits
         assert execution_duration <= 10, f"Budget exceeded: {execution_duration}s"
-        print(f"✅ Agent budget test: execution within {execution_duration:.2f}s")
+        logger.debug("Agent budget test: execution within %.2fs", execution_duration)
 
-    print(f"✅ Agent budget limits enforced successfully")
\ No newline at end of file
+    logger.debug("Agent budget limits enforced successfully")
\ No newline at end of file
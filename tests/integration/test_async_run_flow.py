@@ -1,40 +1,36 @@
 import pytest
-import time
-from fastapi.testclient import TestClient
-from server.main import app
+import asyncio
 import io
 
 
-@pytest.fixture
-def client():
-    return TestClient(app)
+# Minimal single-page PDF containing "Hello World!"
+HELLO_WORLD_PDF = b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n2 0 obj\n<<\n/Type /Pages\n/Kids [3 0 R]\n/Count 1\n>>\nendobj\n3 0 obj\n<<\n/Type /Page\n/Parent 2 0 R\n/MediaBox [0 0 612 792]\n/Contents 4 0 R\n>>\nendobj\n4 0 obj\n<<\n/Length 44\n>>\nstream\nBT\n/F1 12 Tf\n72 720 Td\n(Hello World!) Tj\nET\nendstream\nendobj\nxref\n0 5\n0000000000 65535 f \n0000000009 00000 n \n0000000074 00000 n \n0000000120 00000 n \n0000000179 00000 n \ntrailer\n<<\n/Size 5\n/Root 1 0 R\n>>\nstartxref\n253\n%%EOF"
 
 
-def test_end_to_end_async_flow(client):
+@pytest.mark.asyncio
+async def test_end_to_end_async_flow(async_client):
     """Integration test: end-to-end async flow (create → upload PDF → add nodes → run → poll)"""
     # Step 1: Create a workflow
-    create_response = client.post("/workflows", json={"name": "E2E Test Workflow"})
+    create_response = await async_client.post("/workflows", json={"name": "E2E Test Workflow"})
     assert create_response.status_code == 200
     workflow_id = create_response.json()["id"]
 
     # Step 2: Upload a PDF file
-    pdf_content = b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n2 0 obj\n<<\n/Type /Pages\n/Kids [3 0 R]\n/Count 1\n>>\nendobj\n3 0 obj\n<<\n/Type /Page\n/Parent 2 0 R\n/MediaBox [0 0 612 792]\n/Contents 4 0 R\n>>\nendobj\n4 0 obj\n<<\n/Length 44\n>>\nstream\nBT\n/F1 12 Tf\n72 720 Td\n(Hello World!) Tj\nET\nendstream\nendobj\nxref\n0 5\n0000000000 65535 f \n0000000009 00000 n \n0000000074 00000 n \n0000000120 00000 n \n0000000179 00000 n \ntrailer\n<<\n/Size 5\n/Root 1 0 R\n>>\nstartxref\n253\n%%EOF"
-
-    files = {"file": ("test.pdf", io.BytesIO(pdf_content), "application/pdf")}
-    upload_response = client.post("/files", files=files)
+    files = {"file": ("test.pdf", io.BytesIO(HELLO_WORLD_PDF), "application/pdf")}
+    upload_response = await async_client.post("/files", files=files)
     assert upload_response.status_code == 200
     file_id = upload_response.json()["file_id"]
 
     # Step 3: Add nodes to the workflow
     # Add EXTRACT_TEXT node with file_id config
-    extract_response = client.post(f"/workflows/{workflow_id}/nodes", json={
+    extract_response = await async_client.post(f"/workflows/{workflow_id}/nodes", json={
         "node_type": "extract_text",
         "config": {"file_id": file_id}
     })
     assert extract_response.status_code == 200
 
     # Add GENERATIVE_AI node
-    llm_response = client.post(f"/workflows/{workflow_id}/nodes", json={
+    llm_response = await async_client.post(f"/workflows/{workflow_id}/nodes", json={
         "node_type": "generative_ai",
         "config": {
             "model": "gpt-4.1-mini",
@@ -44,7 +40,7 @@ def test_end_to_end_async_flow(client):
     assert llm_response.status_code == 200
 
     # Add FORMATTER node
-    formatter_response = client.post(f"/workflows/{workflow_id}/nodes", json={
+    formatter_response = await async_client.post(f"/workflows/{workflow_id}/nodes", json={
         "node_type": "formatter",
         "config": {
             "rules": ["lowercase", "full_to_half"]
@@ -53,67 +49,57 @@ def test_end_to_end_async_flow(client):
     assert formatter_response.status_code == 200
 
     # Step 4: Run the workflow asynchronously
-    run_response = client.post(f"/workflows/{workflow_id}/run")
+    run_response = await async_client.post(f"/workflows/{workflow_id}/run")
     assert run_response.status_code == 200
     job_id = run_response.json()["job_id"]
 
-    # Step 5: Poll job status until completion
-    max_polls = 30  # Maximum 30 seconds
-    job_completed = False
-
-    for _ in range(max_polls):
-        job_response = client.get(f"/jobs/{job_id}")
-        assert job_response.status_code == 200
-        job_data = job_response.json()
-
-        if job_data["status"] in ["Succeeded", "Failed"]:
-            job_completed = True
-            final_status = job_data["status"]
-            break
-
-        time.sleep(1)  # Wait 1 second before next poll
+    # Step 5: Long-poll job status until completion
+    max_wait = 30  # Maximum 30 seconds
+    job_response = await async_client.get(f"/jobs/{job_id}", params={"wait": True, "timeout": max_wait})
+    assert job_response.status_code == 200
+    job_data = job_response.json()
+    final_status = job_data["status"]
 
-    assert job_completed, f"Job did not complete within {max_polls} seconds"
+    assert final_status in ["Succeeded", "Failed"], f"Job did not complete within {max_wait} seconds"
     assert final_status == "Succeeded", f"Job failed with status: {final_status}"
 
     # Step 6: Verify final output is available
-    final_job_response = client.get(f"/jobs/{job_id}")
+    final_job_response = await async_client.get(f"/jobs/{job_id}")
     final_job_data = final_job_response.json()
     assert "final_output" in final_job_data
     assert final_job_data["final_output"] is not None
     assert len(final_job_data["final_output"]) > 0
 
 
-def test_async_flow_with_multiple_jobs(client):
+@pytest.mark.asyncio
+async def test_async_flow_with_multiple_jobs(async_client):
     """Integration test: multiple async jobs running with concurrency limits"""
-    # Create a workflow
-    create_response = client.post("/workflows", json={"name": "Concurrency Test Workflow"})
+    # Create a workflow with a simple node
+    create_response = await async_client.post("/workflows", json={
+        "name": "Concurrency Test Workflow",
+        "nodes": [{"node_type": "formatter", "config": {"rules": ["uppercase"]}}]
+    })
+    assert create_response.status_code == 200
     workflow_id = create_response.json()["id"]
 
-    # Add a simple node
-    client.post(f"/workflows/{workflow_id}/nodes", json={
-        "node_type": "formatter",
-        "config": {"rules": ["uppercase"]}
-    })
+    # Start multiple jobs concurrently (should respect concurrency limit of 2 running + queue)
+    run_responses = await asyncio.gather(*[
+        async_client.post(f"/workflows/{workflow_id}/run") for _ in range(5)
+    ])
 
-    # Start multiple jobs (should respect concurrency limit of 2 running + queue)
-    job_ids = []
-    for i in range(5):
-        run_response = client.post(f"/workflows/{workflow_id}/run")
-        if run_response.status_code == 200:
-            job_ids.append(run_response.json()["job_id"])
-        elif run_response.status_code == 429:
-            # Queue is full, which is expected
-            break
+    # Accepted jobs return 200; a full queue is expected to answer 429
+    assert all(r.status_code in (200, 429) for r in run_responses)
+    job_ids = [r.json()["job_id"] for r in run_responses if r.status_code == 200]
 
     # At least one job should have been accepted
     assert len(job_ids) >= 1
 
-    # Wait for jobs to complete
-    time.sleep(5)
+    # Long-poll every job concurrently
+    job_responses = await asyncio.gather(*[
+        async_client.get(f"/jobs/{job_id}", params={"wait": True, "timeout": 10}) for job_id in job_ids
+    ])
 
     # Verify jobs completed successfully
-    for job_id in job_ids:
-        job_response = client.get(f"/jobs/{job_id}")
-        job_data = job_response.json()
-        assert job_data["status"] in ["Succeeded", "Failed", "Running", "Pending"]
\ No newline at end of file
+    for job_response in job_responses:
+        assert job_response.status_code == 200
+        assert job_response.json()["status"] in ["Succeeded", "Failed", "Running", "Pending"]
@@ -1,57 +1,29 @@
+import logging
+import os
+
 import pytest
-import time
-from fastapi.testclient import TestClient
-from server.main import app
 
+logger = logging.getLogger(__name__)
 
-@pytest.fixture
-def client():
-    return TestClient(app)
+# Both tests run generative_ai nodes, which need a real LLM endpoint to succeed
+requires_llm = pytest.mark.skipif(not os.getenv("LLM_API_KEY"), reason="requires LLM_API_KEY")
 
 
-def test_dag_fan_in_out_diamond_pattern(client):
+@requires_llm
+def test_dag_fan_in_out_diamond_pattern(client, create_workflow_with_nodes):
     """Integration test for DAG fan-out/fan-in diamond pattern"""
-    # Create workflow
-    create_response = client.post("/workflows", json={"name": "Diamond DAG Test"})
-    assert create_response.status_code == 200
-    workflow_id = create_response.json()["id"]
-
-    # Add 4 nodes to create diamond pattern: A → B,C → D
-    # Node A (start)
-    node_a_data = {
-        "node_type": "generative_ai",
-        "config": {"prompt": "Start: {text}", "model": "gpt-4.1-mini"}
-    }
-    node_a_response = client.post(f"/workflows/{workflow_id}/nodes", json=node_a_data)
-    assert node_a_response.status_code == 200
-    node_a_id = node_a_response.json()["node_id"]
-
-    # Node B (parallel path 1)
-    node_b_data = {
-        "node_type": "generative_ai",
-        "config": {"prompt": "Path B processing: {text}", "model": "gpt-4.1-mini"}
-    }
-    node_b_response = client.post(f"/workflows/{workflow_id}/nodes", json=node_b_data)
-    assert node_b_response.status_code == 200
-    node_b_id = node_b_response.json()["node_id"]
-
-    # Node C (parallel path 2)
-    node_c_data = {
-        "node_type": "generative_ai",
-        "config": {"prompt": "Path C processing: {text}", "model": "gpt-4.1-mini"}
-    }
-    node_c_response = client.post(f"/workflows/{workflow_id}/nodes", json=node_c_data)
-    assert node_c_response.status_code == 200
-    node_c_id = node_c_response.json()["node_id"]
-
-    # Node D (end - fan-in)
-    node_d_data = {
-        "node_type": "formatter",
-        "config": {"rules": ["lowercase"]}
-    }
-    node_d_response = client.post(f"/workflows/{workflow_id}/nodes", json=node_d_data)
-    assert node_d_response.status_code == 200
-    node_d_id = node_d_response.json()["node_id"]
+    # Create workflow with 4 nodes for the diamond pattern: A → B,C → D
+    workflow_id, node_ids = create_workflow_with_nodes("Diamond DAG Test", [
+        # Node A (start)
+        {"node_type": "generative_ai", "config": {"prompt": "Start: {text}", "model": "gpt-4.1-mini"}},
+        # Node B (parallel path 1)
+        {"node_type": "generative_ai", "config": {"prompt": "Path B processing: {text}", "model": "gpt-4.1-mini"}},
+        # Node C (parallel path 2)
+        {"node_type": "generative_ai", "config": {"prompt": "Path C processing: {text}", "model": "gpt-4.1-mini"}},
+        # Node D (end - fan-in)
+        {"node_type": "formatter", "config": {"rules": ["lowercase"]}},
+    ])
+    node_a_id, node_b_id, node_c_id, node_d_id = node_ids
 
     # Create diamond edges: A → B, A → C, B → D, C → D
     edges = [
@@ -61,9 +33,8 @@ def test_dag_fan_in_out_diamond_pattern(client):
         {"from_node_id": node_c_id, "to_node_id": node_d_id},  # C → D
     ]
 
-    for edge_data in edges:
-        edge_response = client.post(f"/workflows/{workflow_id}/edges", json=edge_data)
-        assert edge_response.status_code == 200
+    edge_response = client.post(f"/workflows/{workflow_id}/edges/bulk", json={"edges": edges})
+    assert edge_response.status_code == 200
 
     # Verify edges were created
     edges_response = client.get(f"/workflows/{workflow_id}/edges")
@@ -75,19 +46,11 @@ def test_dag_fan_in_out_diamond_pattern(client):
     assert run_response.status_code == 200
     job_id = run_response.json()["job_id"]
 
-    # Poll for completion (with timeout)
-    max_polls = 30
-    job_status = None
-    for i in range(max_polls):
-        job_response = client.get(f"/jobs/{job_id}")
-        assert job_response.status_code == 200
-        job_data = job_response.json()
-        job_status = job_data["status"]
-
-        if job_status in ["Succeeded", "Failed"]:
-            break
-
-        time.sleep(1)
+    # Long-poll for completion (with timeout)
+    job_response = client.get(f"/jobs/{job_id}", params={"wait": True, "timeout": 30})
+    assert job_response.status_code == 200
+    job_data = job_response.json()
+    job_status = job_data["status"]
 
     # Verify job succeeded
     assert job_status == "Succeeded", f"Job failed or timed out. Status: {job_status}"
@@ -126,9 +89,10 @@ def test_dag_fan_in_out_diamond_pattern(client):
     final_output = job_data.get("final_output", "")
     assert len(final_output) > 0, "Final output should not be empty"
 
-    print(f"✅ Diamond DAG test passed. Final output: {final_output}")
+    logger.debug("Diamond DAG test passed. Final output: %s", final_output)
 
 
+@requires_llm
 def test_dag_linear_fallback_no_edges(client):
     """Integration test: DAG execution falls back to linear when no edges present"""
     # Create workflow
@@ -156,17 +120,10 @@ def test_dag_linear_fallback_no_edges(client):
     assert run_response.status_code == 200
     job_id = run_response.json()["job_id"]
 
-    # Poll for completion
-    max_polls = 15
-    for i in range(max_polls):
-        job_response = client.get(f"/jobs/{job_id}")
-        assert job_response.status_code == 200
-        job_data = job_response.json()
-
-        if job_data["status"] in ["Succeeded", "Failed"]:
-            break
-
-        time.sleep(1)
+    # Long-poll for completion
+    job_response = client.get(f"/jobs/{job_id}", params={"wait": True, "timeout": 15})
+    assert job_response.status_code == 200
+    job_data = job_response.json()
 
     # Verify successful execution
     assert job_data["status"] == "Succeeded"
@@ -183,4 +140,4 @@ def test_dag_linear_fallback_no_edges(client):
     for step in steps:
         assert step["status"] == "Succeeded"
 
-    print(f"✅ Linear fallback test passed.")
\ No newline at end of file
+    logger.debug("Linear fallback test passed.")
\ No newline at end of file
@@ -1,11 +1,12 @@
 import pytest
-from fastapi.testclient import TestClient
-from server.main import app
 
 
-@pytest.fixture
-def client():
-    return TestClient(app)
+@pytest.fixture(scope="module")
+def validation_workflow_id(client):
+    """One workflow shared by the negative config tests; rejected node adds leave it untouched"""
+    response = client.post("/workflows", json={"name": "LLM Config Validation Shared"})
+    assert response.status_code == 200
+    return response.json()["id"]
 
 
 def test_llm_config_validation_valid(client):
@@ -30,129 +31,23 @@ def test_llm_config_validation_valid(client):
     assert "node_id" in response.json()
 
 
-def test_llm_config_validation_missing_model(client):
-    """Integration test: LLM config missing model should be rejected"""
-    create_response = client.post("/workflows", json={"name": "LLM Invalid Config Test"})
-    workflow_id = create_response.json()["id"]
-
+@pytest.mark.parametrize("invalid_config,expected", [
     # Missing required 'model' field
-    invalid_config = {
-        "prompt": "Summarize the following text: {text}",
-        "max_tokens": 150
-    }
-
-    response = client.post(f"/workflows/{workflow_id}/nodes", json={
-        "node_type": "generative_ai",
-        "config": invalid_config
-    })
-
-    assert response.status_code == 400
-    data = response.json()
-    assert "detail" in data
-    assert "model" in data["detail"].lower()
-
-
-def test_llm_config_validation_missing_prompt(client):
-    """Integration test: LLM config missing prompt should be rejected"""
-    create_response = client.post("/workflows", json={"name": "LLM Invalid Config Test"})
-    workflow_id = create_response.json()["id"]
-
+    ({"prompt": "Summarize the following text: {text}", "max_tokens": 150}, ("model",)),
     # Missing required 'prompt' field
-    invalid_config = {
-        "model": "gpt-3.5-turbo",
-        "max_tokens": 150
-    }
-
-    response = client.post(f"/workflows/{workflow_id}/nodes", json={
-        "node_type": "generative_ai",
-        "config": invalid_config
-    })
-
-    assert response.status_code == 400
-    data = response.json()
-    assert "detail" in data
-    assert "prompt" in data["detail"].lower()
-
-
-def test_llm_config_validation_invalid_model(client):
-    """Integration test: invalid model name should be rejected"""
-    create_response = client.post("/workflows", json={"name": "LLM Invalid Model Test"})
-    workflow_id = create_response.json()["id"]
-
+    ({"model": "gpt-3.5-turbo", "max_tokens": 150}, ("prompt",)),
     # Invalid model name
-    invalid_config = {
-        "model": "invalid-model-name",
-        "prompt": "Summarize: {text}"
-    }
-
-    response = client.post(f"/workflows/{workflow_id}/nodes", json={
-        "node_type": "generative_ai",
-        "config": invalid_config
-    })
-
-    assert response.status_code == 400
-    data = response.json()
-    assert "detail" in data
-    assert "model" in data["detail"].lower()
-
-
-def test_llm_config_validation_invalid_temperature(client):
-    """Integration test: invalid temperature should be rejected"""
-    create_response = client.post("/workflows", json={"name": "LLM Invalid Temp Test"})
-    workflow_id = create_response.json()["id"]
-
+    ({"model": "invalid-model-name", "prompt": "Summarize: {text}"}, ("model",)),
     # Temperature out of valid range (should be 0.0-2.0)
-    invalid_config = {
-        "model": "gpt-3.5-turbo",
-        "prompt": "Summarize: {text}",
-        "temperature": 3.5  # Invalid: too high
-    }
-
-    response = client.post(f"/workflows/{workflow_id}/nodes", json={
-        "node_type": "generative_ai",
-        "config": invalid_config
-    })
-
-    assert response.status_code == 400
-    data = response.json()
-    assert "detail" in data
-    assert "temperature" in data["detail"].lower()
-
-
-def test_llm_config_validation_invalid_max_tokens(client):
-    """Integration test: invalid max_tokens should be rejected"""
-    create_response = client.post("/workflows", json={"name": "LLM Invalid Tokens Test"})
-    workflow_id = create_response.json()["id"]
-
-    # max_tokens too high or negative
-    invalid_config = {
-        "model": "gpt-3.5-turbo",
-        "prompt": "Summarize: {text}",
-        "max_tokens": -50  # Invalid: negative
-    }
-
-    response = client.post(f"/workflows/{workflow_id}/nodes", json={
-        "node_type": "generative_ai",
-        "config": invalid_config
-    })
-
-    assert response.status_code == 400
-    data = response.json()
-    assert "detail" in data
-
-
-def test_llm_config_prompt_placeholder_validation(client):
-    """Integration test: prompt should contain {text} placeholder"""
-    create_response = client.post("/workflows", json={"name": "LLM Prompt Validation Test"})
-    workflow_id = create_response.json()["id"]
-
+    ({"model": "gpt-3.5-turbo", "prompt": "Summarize: {text}", "temperature": 3.5}, ("temperature",)),
+    # max_tokens negative
+    ({"model": "gpt-3.5-turbo", "prompt": "Summarize: {text}", "max_tokens": -50}, ()),
     # Prompt without {text} placeholder
-    invalid_config = {
-        "model": "gpt-3.5-turbo",
-        "prompt": "This prompt has no placeholder for input text"
-    }
-
-    response = client.post(f"/workflows/{workflow_id}/nodes", json={
+    ({"model": "gpt-3.5-turbo", "prompt": "This prompt has no placeholder for input text"}, ("{text}", "placeholder")),
+], ids=["missing_model", "missing_prompt", "invalid_model", "invalid_temperature", "invalid_max_tokens", "prompt_placeholder"])
+def test_llm_config_validation_invalid(client, validation_workflow_id, invalid_config, expected):
+    """Integration test: invalid LLM configs should be rejected with a descriptive detail"""
+    response = client.post(f"/workflows/{validation_workflow_id}/nodes", json={
         "node_type": "generative_ai",
         "config": invalid_config
     })
@@ -160,10 +55,11 @@ def test_llm_config_prompt_placeholder_validation(client):
     assert response.status_code == 400
     data = response.json()
     assert "detail" in data
-    assert "{text}" in data["detail"] or "placeholder" in data["detail"].lower()
+    # The detail should mention at least one of the expected keywords (if any)
+    assert not expected or any(keyword in data["detail"].lower() for keyword in expected)
 
 
-def test_llm_execution_failure_messaging(client):
+def test_llm_execution_failure_messaging(client, wait_for_job):
     """Integration test: LLM execution failures should provide clear error messages"""
     create_response = client.post("/workflows", json={"name": "LLM Failure Test"})
     workflow_id = create_response.json()["id"]
@@ -183,13 +79,8 @@ def test_llm_execution_failure_messaging(client):
     run_response = client.post(f"/workflows/{workflow_id}/run")
     job_id = run_response.json()["job_id"]
 
-    # Wait for completion
-    import time
-    time.sleep(3)
-
-    # Check that error message is clear and helpful
-    job_response = client.get(f"/jobs/{job_id}")
-    job_data = job_response.json()
+    # Wait for completion, then check that error message is clear and helpful
+    job_data = wait_for_job(job_id, timeout=3)
 
     if job_data["status"] == "Failed":
         assert "error_message" in job_data
@@ -201,41 +92,37 @@ def test_llm_execution_failure_messaging(client):
         assert any(keyword in error_msg for keyword in helpful_keywords)
 
 
-def test_llm_supported_models_list(client):
-    """Integration test: only supported models should be accepted"""
+@pytest.mark.parametrize("model", ["gpt-4.1-mini", "gpt-4o", "gpt-5"])
+def test_llm_supported_model_accepted(client, model):
+    """Integration test: each supported model should be accepted"""
     create_response = client.post("/workflows", json={"name": "Supported Models Test"})
     workflow_id = create_response.json()["id"]
 
-    # Test supported models
-    supported_models = [
-        "gpt-4.1-mini",
-        "gpt-4o",
-        "gpt-5"
-    ]
+    config = {
+        "model": model,
+        "prompt": "Test prompt: {text}"
+    }
 
-    for model in supported_models:
-        config = {
-            "model": model,
-            "prompt": "Test prompt: {text}"
-        }
+    response = client.post(f"/workflows/{workflow_id}/nodes", json={
+        "node_type": "generative_ai",
+        "config": config
+    })
 
-        response = client.post(f"/workflows/{workflow_id}/nodes", json={
-            "node_type": "generative_ai",
-            "config": config
-        })
+    # Should accept all supported models
+    assert response.status_code == 200
 
-        # Should accept all supported models
-        assert response.status_code == 200
 
+def test_llm_unsupported_model_rejected(client, validation_workflow_id):
+    """Integration test: unsupported models should be rejected"""
     # Test unsupported model
     unsupported_config = {
         "model": "unsupported-model-xyz",
         "prompt": "Test prompt: {text}"
     }
 
-    response = client.post(f"/workflows/{workflow_id}/nodes", json={
+    response = client.post(f"/workflows/{validation_workflow_id}/nodes", json={
         "node_type": "generative_ai",
         "config": unsupported_config
     })
 
-    assert response.status_code == 400
\ No newline at end of file
+    assert response.status_code == 400
@@ -1,20 +1,10 @@
 import pytest
-from fastapi.testclient import TestClient
-from server.main import app
 import io
 
 
-@pytest.fixture
-def client():
-    return TestClient(app)
-
-
-def test_pdf_validation_valid_pdf(client):
+def test_pdf_validation_valid_pdf(client, minimal_pdf_bytes):
     """Integration test: valid PDF should be accepted"""
-    # Create a valid minimal PDF
-    pdf_content = b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n2 0 obj\n<<\n/Type /Pages\n/Kids [3 0 R]\n/Count 1\n>>\nendobj\n3 0 obj\n<<\n/Type /Page\n/Parent 2 0 R\n/MediaBox [0 0 612 792]\n/Contents 4 0 R\n>>\nendobj\n4 0 obj\n<<\n/Length 44\n>>\nstream\nBT\n/F1 12 Tf\n72 720 Td\n(Test PDF Content) Tj\nET\nendstream\nendobj\nxref\n0 5\n0000000000 65535 f \n0000000009 00000 n \n0000000074 00000 n \n0000000120 00000 n \n0000000179 00000 n \ntrailer\n<<\n/Size 5\n/Root 1 0 R\n>>\nstartxref\n253\n%%EOF"
-
-    files = {"file": ("valid.pdf", io.BytesIO(pdf_content), "application/pdf")}
+    files = {"file": ("valid.pdf", io.BytesIO(minimal_pdf_bytes), "application/pdf")}
     response = client.post("/files", files=files)
 
     assert response.status_code == 200
@@ -37,15 +27,10 @@ def test_pdf_validation_mime_type_check(client):
     assert "mime" in data["detail"].lower() or "pdf" in data["detail"].lower()
 
 
-def test_pdf_validation_file_size_limit(client):
+def test_pdf_validation_file_size_limit(client, oversized_pdf_bytes):
     """Integration test: oversized PDF should be rejected"""
-    # Create a PDF that exceeds size limit (assume 10MB limit)
-    large_pdf_header = b"%PDF-1.4\n"
-    large_content = b"x" * (11 * 1024 * 1024)  # 11MB
-    large_pdf_footer = b"\n%%EOF"
-    large_pdf = large_pdf_header + large_content + large_pdf_footer
-
-    files = {"file": ("large.pdf", io.BytesIO(large_pdf), "application/pdf")}
+    # PDF that exceeds the size limit (assume 10MB limit)
+    files = {"file": ("large.pdf", io.BytesIO(oversized_pdf_bytes), "application/pdf")}
     response = client.post("/files", files=files)
 
     assert response.status_code == 413  # Payload too large
@@ -146,12 +131,10 @@ def test_pdf_validation_empty_file(client):
     assert "empty" in data["detail"].lower() or "size" in data["detail"].lower()
 
 
-def test_pdf_validation_no_file_extension(client):
+def test_pdf_validation_no_file_extension(client, minimal_pdf_bytes):
     """Integration test: file without .pdf extension should be handled gracefully"""
     # Valid PDF content but no .pdf extension
-    pdf_content = b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n2 0 obj\n<<\n/Type /Pages\n/Kids [3 0 R]\n/Count 1\n>>\nendobj\n3 0 obj\n<<\n/Type /Page\n/Parent 2 0 R\n/MediaBox [0 0 612 792]\n>>\nendobj\nxref\n0 4\n0000000000 65535 f \n0000000009 00000 n \n0000000074 00000 n \n0000000120 00000 n \ntrailer\n<<\n/Size 4\n/Root 1 0 R\n>>\nstartxref\n193\n%%EOF"
-
-    files = {"file": ("document", io.BytesIO(pdf_content), "application/pdf")}
+    files = {"file": ("document", io.BytesIO(minimal_pdf_bytes), "application/pdf")}
     response = client.post("/files", files=files)
 
     # Should accept based on MIME type, not extension
@@ -160,7 +143,7 @@ def test_pdf_validation_no_file_extension(client):
     assert "file_id" in data
 
 
-def test_pdf_text_extraction_success(client):
+def test_pdf_text_extraction_success(client, wait_for_job):
     """Integration test: PDF text extraction should work for valid PDFs"""
     # Create workflow with extract_text node
     create_response = client.post("/workflows", json={"name": "PDF Extraction Test"})
@@ -231,13 +214,8 @@ startxref
     run_response = client.post(f"/workflows/{workflow_id}/run")
     job_id = run_response.json()["job_id"]
 
-    # Wait for completion
-    import time
-    time.sleep(3)
-
-    # Check extracted text
-    job_response = client.get(f"/jobs/{job_id}")
-    job_data = job_response.json()
+    # Wait for completion, then check extracted text
+    job_data = wait_for_job(job_id, timeout=3)
 
     assert job_data["status"] == "Succeeded"
     assert "final_output" in job_data
@@ -245,7 +223,7 @@ startxref
     assert "Hello PDF World!" in job_data["final_output"]
 
 
-def test_pdf_text_extraction_failure_handling(client):
+def test_pdf_text_extraction_failure_handling(client, wait_for_job):
     """Integration test: PDF text extraction should handle failures gracefully"""
     # Create workflow
     create_response = client.post("/workflows", json={"name": "PDF Extraction Failure Test"})
@@ -261,13 +239,8 @@ def test_pdf_text_extraction_failure_handling(client):
     run_response = client.post(f"/workflows/{workflow_id}/run")
     job_id = run_response.json()["job_id"]
 
-    # Wait for completion
-    import time
-    time.sleep(3)
-
-    # Check that failure is handled gracefully
-    job_response = client.get(f"/jobs/{job_id}")
-    job_data = job_response.json()
+    # Wait for completion, then check that failure is handled gracefully
+    job_data = wait_for_job(job_id, timeout=3)
 
     assert job_data["status"] == "Failed"
     assert "error_message" in job_data
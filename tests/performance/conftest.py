@@ -0,0 +1,78 @@
+import json
+import platform
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+from server.database import engine
+
+# Baselines recorded with --update-perf-baseline, keyed by host class so an arm64 laptop and an
+# x86_64 CI runner don't share numbers. No baseline ships with the repo: until one is recorded on a
+# host, perf_gate only enforces the hard limits there.
+BASELINE_FILE = Path(__file__).parent / ".perf_baseline.json"
+HOST_CLASS = platform.machine() or "unknown"
+
+# Sub-millisecond timings jitter by more than any percentage, so allow this much absolute slack too
+NOISE_FLOOR_SECONDS = 0.005
+
+
+def _disable_synchronous_commit(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("SET synchronous_commit TO OFF")
+    cursor.close()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _fast_commits():
+    """Don't wait for the WAL flush on commit; test data doesn't need to survive a crash
+
+    Module-scoped, so the setting is removed when each performance module finishes instead of
+    staying on the shared engine for whatever tests run after it in the session.
+    """
+    event.listen(engine, "connect", _disable_synchronous_commit)
+    # Drop pooled connections so every connection from here on gets the setting
+    engine.dispose()
+
+    yield
+
+    event.remove(engine, "connect", _disable_synchronous_commit)
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def _perf_baselines(request):
+    """Load baselines once; with --update-perf-baseline, write this run's timings back at the end"""
+    baselines = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+    measured = {}
+
+    yield baselines.get(HOST_CLASS, {}), measured
+
+    if request.config.getoption("--update-perf-baseline") and measured:
+        baselines.setdefault(HOST_CLASS, {}).update(measured)
+        BASELINE_FILE.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture
+def perf_gate(request, _perf_baselines):
+    """Check a timing against its hard limit and, when one is recorded, this host's baseline
+
+    perf_gate(name, seconds, limit, tolerance=0.3) fails if seconds >= limit, or if it is more
+    than `tolerance` slower than the stored baseline for `name`.
+    """
+    host_baselines, measured = _perf_baselines
+    updating = request.config.getoption("--update-perf-baseline")
+
+    def _gate(name, seconds, limit, tolerance=0.3):
+        assert seconds < limit, f"{name} took {seconds:.3f}s, hard limit {limit}s"
+        measured[name] = seconds
+
+        baseline = host_baselines.get(name)
+        if baseline is None or updating:
+            return
+        allowed = max(baseline * (1 + tolerance), baseline + NOISE_FLOOR_SECONDS)
+        assert seconds <= allowed, (
+            f"{name} regressed: {seconds:.4f}s vs baseline {baseline:.4f}s on {HOST_CLASS} "
+            f"(allowed {allowed:.4f}s)"
+        )
+
+    return _gate
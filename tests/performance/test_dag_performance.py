@@ -1,6 +1,14 @@
 import pytest
+import sys
 import time
+import timeit
+import math
+import functools
+import itertools
+import statistics
 import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, AsyncMock
 from server.services.graph_service import topo_schedule, validate_edges_no_cycles
 from server.services.job_service import JobService
@@ -9,85 +17,100 @@ from server.db_models import NodeDB, EdgeDB
 
 class MockNode:
     """Mock node for performance testing"""
+    __slots__ = ("id",)
+
     def __init__(self, node_id: str):
-        self.id = node_id
+        self.id = sys.intern(node_id)
 
 
 class MockEdge:
     """Mock edge for performance testing"""
+    __slots__ = ("workflow_id", "from_node_id", "from_port", "to_node_id", "to_port", "condition")
+
     def __init__(self, from_node_id: str, to_node_id: str):
         self.workflow_id = "perf-test"
-        self.from_node_id = from_node_id
+        # Interned so node IDs shared by nodes and edges are one object and dict/set
+        # lookups in the graph functions hit the identity fast path
+        self.from_node_id = sys.intern(from_node_id)
         self.from_port = "output"
-        self.to_node_id = to_node_id
+        self.to_node_id = sys.intern(to_node_id)
         self.to_port = "input"
         self.condition = None
 
 
+@functools.lru_cache(maxsize=None)
 def create_linear_dag(size: int):
-    """Create a linear DAG: N1 -> N2 -> N3 -> ... -> Nn"""
+    """Create a linear DAG: N1 -> N2 -> N3 -> ... -> Nn (cached; returns immutable tuples)"""
     nodes = [MockNode(f"N{i}") for i in range(1, size + 1)]
     edges = [MockEdge(f"N{i}", f"N{i+1}") for i in range(1, size)]
-    return nodes, edges
+    return tuple(nodes), tuple(edges)
 
 
+@functools.lru_cache(maxsize=None)
 def create_diamond_dag(layers: int):
-    """Create a diamond-shaped DAG with specified layers"""
-    nodes = []
-    edges = []
-
-    # Create nodes
-    for layer in range(layers):
-        if layer == 0 or layer == layers - 1:
-            # Start and end layers have 1 node
-            nodes.append(MockNode(f"L{layer}N1"))
-        else:
-            # Middle layers have 2 nodes
-            nodes.append(MockNode(f"L{layer}N1"))
-            nodes.append(MockNode(f"L{layer}N2"))
-
-    # Create edges
-    for layer in range(layers - 1):
-        if layer == 0:
-            # From start to first diamond layer
-            edges.append(MockEdge("L0N1", "L1N1"))
-            edges.append(MockEdge("L0N1", "L1N2"))
-        elif layer == layers - 2:
-            # From last diamond layer to end
-            edges.append(MockEdge(f"L{layer}N1", f"L{layer+1}N1"))
-            edges.append(MockEdge(f"L{layer}N2", f"L{layer+1}N1"))
-        else:
-            # Between diamond layers (full connectivity)
-            for from_n in range(1, 3):
-                for to_n in range(1, 3):
-                    edges.append(MockEdge(f"L{layer}N{from_n}", f"L{layer+1}N{to_n}"))
-
-    return nodes, edges
-
-
+    """Create a diamond-shaped DAG with specified layers (cached; returns immutable tuples)"""
+    # Start and end layers have 1 node, middle layers have 2 nodes
+    nodes = [
+        MockNode(f"L{layer}N{n}")
+        for layer in range(layers)
+        for n in ((1,) if layer in (0, layers - 1) else (1, 2))
+    ]
+
+    # From start to first diamond layer
+    edges = [MockEdge("L0N1", "L1N1"), MockEdge("L0N1", "L1N2")]
+    # Between diamond layers (full connectivity)
+    edges.extend(
+        MockEdge(f"L{layer}N{from_n}", f"L{layer+1}N{to_n}")
+        for layer in range(1, layers - 2)
+        for from_n, to_n in itertools.product((1, 2), (1, 2))
+    )
+    # From last diamond layer to end
+    edges.extend(MockEdge(f"L{layers-2}N{n}", f"L{layers-1}N1") for n in (1, 2))
+
+    return tuple(nodes), tuple(edges)
+
+
+@functools.lru_cache(maxsize=None)
 def create_fan_out_dag(fan_factor: int):
-    """Create fan-out DAG: 1 root -> fan_factor nodes -> 1 end"""
+    """Create fan-out DAG: 1 root -> fan_factor nodes -> 1 end (cached; returns immutable tuples)"""
+    fan_ids = [f"FAN{i}" for i in range(fan_factor)]
+
     nodes = [MockNode("ROOT")]
-    edges = []
+    nodes.extend(MockNode(node_id) for node_id in fan_ids)
+    nodes.append(MockNode("END"))
 
-    # Fan-out nodes
-    for i in range(fan_factor):
-        node_id = f"FAN{i}"
-        nodes.append(MockNode(node_id))
-        edges.append(MockEdge("ROOT", node_id))
+    edges = [MockEdge("ROOT", node_id) for node_id in fan_ids]
+    edges.extend(MockEdge(node_id, "END") for node_id in fan_ids)
 
-    # End node
-    nodes.append(MockNode("END"))
-    for i in range(fan_factor):
-        edges.append(MockEdge(f"FAN{i}", "END"))
+    return tuple(nodes), tuple(edges)
+
+
+def _best_time(fn, repeat: int = 5) -> float:
+    """Best-of-N single-shot timing, less noisy than one perf_counter sample"""
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def _assert_linear_scaling(sizes, times, max_slope: float = 1.15):
+    """
+    Assert O(V+E) scaling via the least-squares slope of log(time) over log(size).
 
-    return nodes, edges
+    Both validate_edges_no_cycles (white/gray/black DFS) and topo_schedule
+    (Kahn-style in-degree batching) visit each node and edge once, so the slope
+    should stay near 1; a quadratic regression shows up as a slope near 2.
+    """
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(t) for t in times]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    slope = (sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) /
+             sum((x - x_mean) ** 2 for x in xs))
+    assert slope <= max_slope, f"Super-linear scaling: log-log slope {slope:.2f} > {max_slope}"
 
 
 class TestDAGPerformance:
     """Performance tests for DAG operations"""
 
-    def test_cycle_detection_linear_performance(self):
+    def test_cycle_detection_linear_performance(self, perf_gate):
         """Test cycle detection performance on linear DAGs"""
         sizes = [10, 50, 100, 500]
         times = []
@@ -95,25 +118,18 @@ class TestDAGPerformance:
         for size in sizes:
             nodes, edges = create_linear_dag(size)
 
-            start_time = time.perf_counter()
-            validate_edges_no_cycles("perf-test", edges, nodes)
-            end_time = time.perf_counter()
-
-            execution_time = end_time - start_time
+            execution_time = _best_time(lambda: validate_edges_no_cycles("perf-test", edges, nodes))
             times.append(execution_time)
 
             # Should complete quickly even for large graphs
-            assert execution_time < 1.0, f"Cycle detection too slow for {size} nodes: {execution_time:.3f}s"
+            perf_gate(f"cycle_detection_linear_{size}", execution_time, limit=1.0)
 
         print(f"\nCycle Detection Performance (Linear DAG):")
         for size, exec_time in zip(sizes, times):
             print(f"  {size:3d} nodes: {exec_time:.3f}s")
 
-        # Should scale reasonably (not exponentially)
-        if len(times) >= 2:
-            scaling_factor = times[-1] / times[0]
-            size_factor = sizes[-1] / sizes[0]
-            assert scaling_factor < size_factor * 2, f"Poor scaling: {scaling_factor:.2f}x time for {size_factor}x size"
+        # Should scale linearly
+        _assert_linear_scaling(sizes, times)
 
     def test_cycle_detection_diamond_performance(self):
         """Test cycle detection performance on diamond DAGs"""
@@ -137,7 +153,7 @@ class TestDAGPerformance:
         for layers, exec_time in zip(layer_counts, times):
             print(f"  {layers:2d} layers: {exec_time:.3f}s")
 
-    def test_topological_scheduling_performance(self):
+    def test_topological_scheduling_performance(self, perf_gate):
         """Test topological scheduling performance"""
         sizes = [10, 50, 100, 200]
         times = []
@@ -145,24 +161,23 @@ class TestDAGPerformance:
         for size in sizes:
             nodes, edges = create_linear_dag(size)
 
-            start_time = time.perf_counter()
-            batches = list(topo_schedule(edges, nodes))
-            end_time = time.perf_counter()
-
-            execution_time = end_time - start_time
+            batch_count = sum(1 for _ in topo_schedule(edges, nodes))
+            execution_time = _best_time(lambda: deque(topo_schedule(edges, nodes), maxlen=0))
             times.append(execution_time)
 
             # Verify correctness
-            assert len(batches) == size  # Linear chain should have n batches
+            assert batch_count == size  # Linear chain should have n batches
 
             # Should complete quickly
-            assert execution_time < 1.0, f"Topological scheduling too slow for {size} nodes: {execution_time:.3f}s"
+            perf_gate(f"topo_schedule_linear_{size}", execution_time, limit=1.0)
 
         print(f"\nTopological Scheduling Performance:")
         for size, exec_time in zip(sizes, times):
             print(f"  {size:3d} nodes: {exec_time:.3f}s")
 
-    def test_fan_out_scheduling_performance(self):
+        _assert_linear_scaling(sizes, times)
+
+    def test_fan_out_scheduling_performance(self, perf_gate):
         """Test performance with high fan-out DAGs"""
         fan_factors = [5, 20, 50, 100]
         times = []
@@ -170,72 +185,87 @@ class TestDAGPerformance:
         for fan_factor in fan_factors:
             nodes, edges = create_fan_out_dag(fan_factor)
 
-            start_time = time.perf_counter()
-            batches = list(topo_schedule(edges, nodes))
-            end_time = time.perf_counter()
-
-            execution_time = end_time - start_time
+            batch_sizes = [len(batch) for batch in topo_schedule(edges, nodes)]
+            execution_time = _best_time(lambda: deque(topo_schedule(edges, nodes), maxlen=0))
             times.append(execution_time)
 
             # Verify correctness: should have 3 batches (root, fan-out nodes, end)
-            assert len(batches) == 3
-            assert len(batches[1]) == fan_factor  # Middle batch should have all fan-out nodes
+            assert len(batch_sizes) == 3
+            assert batch_sizes[1] == fan_factor  # Middle batch should have all fan-out nodes
 
             # Should handle high parallelism efficiently
-            assert execution_time < 1.0, f"Fan-out scheduling too slow for {fan_factor} parallel: {execution_time:.3f}s"
+            perf_gate(f"topo_schedule_fan_out_{fan_factor}", execution_time, limit=1.0)
 
         print(f"\nFan-out Scheduling Performance:")
         for fan_factor, exec_time in zip(fan_factors, times):
             print(f"  {fan_factor:3d} parallel: {exec_time:.3f}s")
 
+        _assert_linear_scaling(fan_factors, times)
+
     def test_memory_usage_large_dag(self):
         """Test memory efficiency with large DAGs"""
         # Create a moderately large DAG
         nodes, edges = create_diamond_dag(8)  # ~15 nodes, ~32 edges
 
-        # Measure memory indirectly by ensuring operations complete
+        def dag_operation(_):
+            validate_edges_no_cycles("perf-test", edges, nodes)
+            return list(topo_schedule(edges, nodes))
+
+        # Multiple operations to stress test, first serially...
         start_time = time.perf_counter()
+        serial_results = [dag_operation(i) for i in range(100)]
+        serial_time = time.perf_counter() - start_time
 
-        # Multiple operations to stress test
-        for _ in range(100):
-            validate_edges_no_cycles("perf-test", edges, nodes)
-            list(topo_schedule(edges, nodes))
+        # ...then from a thread pool; the graph functions share no mutable state,
+        # so any hidden contention or shared-state bug shows up as a slowdown or a mismatch
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            pooled_results = list(executor.map(dag_operation, range(100)))
+        pooled_time = time.perf_counter() - start_time
 
-        end_time = time.perf_counter()
-        execution_time = end_time - start_time
+        assert pooled_results == serial_results
 
         # Should handle repeated operations efficiently
-        assert execution_time < 5.0, f"Memory/efficiency issue: {execution_time:.3f}s for 100 iterations"
+        assert serial_time < 5.0, f"Memory/efficiency issue: {serial_time:.3f}s for 100 iterations"
+        assert pooled_time < 5.0, f"Contention issue: {pooled_time:.3f}s for 100 pooled iterations"
 
         print(f"\nMemory Efficiency Test:")
-        print(f"  100 iterations on 8-layer diamond: {execution_time:.3f}s")
+        print(f"  100 iterations on 8-layer diamond: {serial_time:.3f}s serial, {pooled_time:.3f}s pooled")
 
     @pytest.mark.asyncio
     async def test_concurrent_dag_operations(self):
         """Test performance under concurrent DAG operations"""
         nodes, edges = create_fan_out_dag(20)
 
-        async def dag_operation():
-            """Simulate concurrent DAG operations"""
+        def run_dag():
             validate_edges_no_cycles("perf-test", edges, nodes)
-            return list(topo_schedule(edges, nodes))
+            return sum(1 for _ in topo_schedule(edges, nodes))
+
+        async def dag_operation():
+            """Simulate concurrent DAG operations (sync work is offloaded so it doesn't block the loop)"""
+            return await asyncio.to_thread(run_dag)
 
         # Run multiple concurrent operations
         start_time = time.perf_counter()
 
-        tasks = [dag_operation() for _ in range(10)]
-        results = await asyncio.gather(*tasks)
+        # Check each result as it lands; a failed assertion exits the TaskGroup,
+        # which cancels the operations still pending
+        completed = 0
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(dag_operation()) for _ in range(10)]
+            for next_done in asyncio.as_completed(tasks):
+                batch_count = await next_done
+                assert batch_count == 3  # Fan-out DAG should have 3 batches
+                completed += 1
 
         end_time = time.perf_counter()
         execution_time = end_time - start_time
 
         # Verify all operations completed correctly
-        assert len(results) == 10
-        for result in results:
-            assert len(result) == 3  # Fan-out DAG should have 3 batches
+        assert completed == 10
 
         # Should handle concurrency efficiently
-        assert execution_time < 2.0, f"Concurrent operations too slow: {execution_time:.3f}s"
+        assert execution_time < 1.0, f"Concurrent operations too slow: {execution_time:.3f}s"
 
         print(f"\nConcurrent Operations Test:")
         print(f"  10 concurrent DAG operations: {execution_time:.3f}s")
@@ -255,7 +285,7 @@ class TestDAGPerformance:
 
             # Should handle edge cases gracefully
             validate_edges_no_cycles("perf-test", edges, nodes)
-            batches = list(topo_schedule(edges, nodes))
+            deque(topo_schedule(edges, nodes), maxlen=0)
 
             end_time = time.perf_counter()
             execution_time = end_time - start_time
@@ -267,10 +297,20 @@ class TestDAGPerformance:
 
     def test_worst_case_cycle_detection(self):
         """Test cycle detection on worst-case scenarios"""
-        # Create a cycle at the end of a long chain
-        nodes = [MockNode(f"N{i}") for i in range(1, 101)]  # 100 nodes
-        edges = [MockEdge(f"N{i}", f"N{i+1}") for i in range(1, 100)]  # Linear chain
-        edges.append(MockEdge("N100", "N1"))  # Add cycle
+        # "Broom" graph: a 200-node chain plus many skip edges into already-explored
+        # parts of the chain. A DFS without a fully-explored (black) memo re-walks those
+        # subgraphs over and over, which blows up combinatorially.
+        nodes = [MockNode(f"N{i}") for i in range(1, 201)]
+        edges = [MockEdge(f"N{i}", f"N{i+1}") for i in range(1, 200)]  # Linear chain
+        edges += [MockEdge(f"N{i}", f"N{j}") for i in range(1, 100) for j in range(i + 2, 201, 7)]
+
+        # Acyclic broom: the whole graph has to be explored
+        start_time = time.perf_counter()
+        validate_edges_no_cycles("perf-test", edges, nodes)
+        acyclic_time = time.perf_counter() - start_time
+
+        # Close the chain into a cycle
+        edges.append(MockEdge("N200", "N1"))
 
         start_time = time.perf_counter()
 
@@ -281,35 +321,35 @@ class TestDAGPerformance:
         execution_time = end_time - start_time
 
         # Should detect cycle quickly even in worst case
-        assert execution_time < 2.0, f"Worst-case cycle detection too slow: {execution_time:.3f}s"
+        assert acyclic_time < 0.5, f"Worst-case DAG traversal too slow: {acyclic_time:.3f}s"
+        assert execution_time < 0.5, f"Worst-case cycle detection too slow: {execution_time:.3f}s"
 
         print(f"\nWorst-case Cycle Detection:")
-        print(f"  100-node chain with cycle: {execution_time:.3f}s")
+        print(f"  200-node broom without cycle: {acyclic_time:.3f}s")
+        print(f"  200-node broom with cycle: {execution_time:.3f}s")
 
-    def test_performance_regression_benchmark(self):
+    def test_performance_regression_benchmark(self, perf_gate):
         """Benchmark test for performance regression detection"""
         # Standard benchmark: 50-node linear DAG
         nodes, edges = create_linear_dag(50)
 
-        # Run multiple iterations for stable timing
-        times = []
-        for _ in range(20):
-            start_time = time.perf_counter()
-
+        def run_once():
             validate_edges_no_cycles("perf-test", edges, nodes)
-            list(topo_schedule(edges, nodes))
+            deque(topo_schedule(edges, nodes), maxlen=0)
 
-            end_time = time.perf_counter()
-            times.append(end_time - start_time)
+        # Warm up, then take 50 single-shot rounds for stable timing
+        timeit.repeat(run_once, number=1, repeat=5)
+        times = timeit.repeat(run_once, number=1, repeat=50)
 
-        avg_time = sum(times) / len(times)
+        # Median rejects GC/scheduler outliers that skew a plain mean
+        median_time = statistics.median(times)
         max_time = max(times)
 
         # Performance benchmarks for regression detection
-        assert avg_time < 0.1, f"Average performance regression: {avg_time:.3f}s > 0.1s"
+        perf_gate("regression_linear_50_median", median_time, limit=0.1)
         assert max_time < 0.2, f"Max performance regression: {max_time:.3f}s > 0.2s"
 
         print(f"\nPerformance Benchmark (50-node linear DAG):")
-        print(f"  Average time: {avg_time:.3f}s")
+        print(f"  Median time: {median_time:.3f}s")
         print(f"  Maximum time: {max_time:.3f}s")
-        print(f"  Iterations: {len(times)}")
\ No newline at end of file
+        print(f"  Rounds: {len(times)} (after 5 warmup rounds)")
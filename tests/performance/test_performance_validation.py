@@ -1,14 +1,35 @@
 import pytest
 import time
 import asyncio
+import tracemalloc
 from fastapi.testclient import TestClient
 from server.main import app
 import io
+import orjson
 
 
-@pytest.fixture
+JSON_HEADERS = {"content-type": "application/json"}
+
+# Node bodies reused across loops, serialized once
+LOWERCASE_FORMATTER_NODE = orjson.dumps({"node_type": "formatter", "config": {"rules": ["lowercase"]}})
+UPPERCASE_FORMATTER_NODE = orjson.dumps({"node_type": "formatter", "config": {"rules": ["uppercase"]}})
+
+# Reasonably sized PDF (~65KB) for upload timing, built once at import
+UPLOAD_PDF_BYTES = b"%PDF-1.4\n" + b"Test content " * 5000 + b"\n%%EOF"
+
+
+def jpost(client, url, body):
+    """POST a JSON body serialized with orjson; pre-serialized bytes are sent as-is"""
+    content = body if isinstance(body, bytes) else orjson.dumps(body)
+    return client.post(url, content=content, headers=JSON_HEADERS)
+
+
+@pytest.fixture(scope="module")
 def client():
-    return TestClient(app)
+    """Module-wide TestClient, warmed up so cold-start costs stay out of the timed windows"""
+    with TestClient(app) as test_client:
+        test_client.post("/workflows", json={"name": "Warmup"})
+        yield test_client
 
 
 class TestPerformanceValidation:
@@ -27,12 +48,9 @@ class TestPerformanceValidation:
 
     def test_file_upload_performance(self, client):
         """Test PDF file upload completes within acceptable time"""
-        # Create a reasonably sized PDF (around 100KB)
-        pdf_content = b"%PDF-1.4\n" + b"Test content " * 5000 + b"\n%%EOF"
-
         start_time = time.time()
 
-        files = {"file": ("performance_test.pdf", io.BytesIO(pdf_content), "application/pdf")}
+        files = {"file": ("performance_test.pdf", io.BytesIO(UPLOAD_PDF_BYTES), "application/pdf")}
         response = client.post("/files", files=files)
 
         execution_time = time.time() - start_time
@@ -87,7 +105,7 @@ class TestPerformanceValidation:
         assert response.status_code == 200
         assert execution_time < 1.0, f"Job status polling took {execution_time:.2f}s, expected < 1.0s"
 
-    def test_workflow_execution_performance(self, client):
+    def test_workflow_execution_performance(self, client, wait_for_job):
         """Test complete workflow execution completes within reasonable time"""
         # Create workflow
         workflow_response = client.post("/workflows", json={"name": "Execution Performance Test"})
@@ -105,69 +123,40 @@ class TestPerformanceValidation:
         run_response = client.post(f"/workflows/{workflow_id}/run")
         job_id = run_response.json()["job_id"]
 
-        # Poll until completion
-        max_polls = 30
-        for _ in range(max_polls):
-            job_response = client.get(f"/jobs/{job_id}")
-            job_data = job_response.json()
-
-            if job_data["status"] in ["Succeeded", "Failed"]:
-                break
-
-            time.sleep(0.5)
+        # Long-poll until completion
+        job_data = wait_for_job(job_id, timeout=15)
 
         execution_time = time.time() - start_time
 
         assert job_data["status"] == "Succeeded"
         assert execution_time < 15.0, f"Workflow execution took {execution_time:.2f}s, expected < 15.0s"
 
-    def test_concurrent_requests_performance(self, client):
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_performance(self, async_client):
         """Test system handles multiple concurrent requests efficiently"""
-        import threading
-        import queue
-
-        results = queue.Queue()
-
-        def create_workflow(thread_id):
+        async def create_workflow(request_id):
             start_time = time.time()
             try:
-                response = client.post("/workflows", json={"name": f"Concurrent Test {thread_id}"})
-                execution_time = time.time() - start_time
-                results.put((thread_id, response.status_code, execution_time))
-            except Exception as e:
-                results.put((thread_id, 500, time.time() - start_time))
-
-        # Start 5 concurrent workflow creation requests
-        threads = []
-        overall_start = time.time()
-
-        for i in range(5):
-            thread = threading.Thread(target=create_workflow, args=(i,))
-            threads.append(thread)
-            thread.start()
-
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+                response = await async_client.post("/workflows", json={"name": f"Concurrent Test {request_id}"})
+                return response.status_code, time.time() - start_time
+            except Exception:
+                return 500, time.time() - start_time
 
+        # Issue 5 concurrent workflow creation requests
+        overall_start = time.time()
+        results = await asyncio.gather(*(create_workflow(i) for i in range(5)))
         overall_time = time.time() - overall_start
 
         # Collect results
-        execution_times = []
-        success_count = 0
-
-        while not results.empty():
-            thread_id, status_code, exec_time = results.get()
-            execution_times.append(exec_time)
-            if status_code == 200:
-                success_count += 1
+        execution_times = [exec_time for _, exec_time in results]
+        success_count = sum(1 for status_code, _ in results if status_code == 200)
 
         # Validate performance
         assert success_count >= 4, f"Only {success_count}/5 concurrent requests succeeded"
         assert overall_time < 10.0, f"Concurrent requests took {overall_time:.2f}s, expected < 10.0s"
         assert max(execution_times) < 5.0, f"Slowest request took {max(execution_times):.2f}s, expected < 5.0s"
 
-    def test_large_workflow_performance(self, client):
+    def test_large_workflow_performance(self, client, wait_for_job):
         """Test workflow with multiple nodes performs adequately"""
         # Create workflow
         workflow_response = client.post("/workflows", json={"name": "Large Workflow Test"})
@@ -177,10 +166,8 @@ class TestPerformanceValidation:
 
         # Add multiple nodes
         for i in range(5):
-            client.post(f"/workflows/{workflow_id}/nodes", json={
-                "node_type": "formatter",
-                "config": {"rules": ["lowercase"] if i % 2 == 0 else ["uppercase"]}
-            })
+            jpost(client, f"/workflows/{workflow_id}/nodes",
+                  LOWERCASE_FORMATTER_NODE if i % 2 == 0 else UPPERCASE_FORMATTER_NODE)
 
         node_addition_time = time.time() - start_time
 
@@ -189,16 +176,8 @@ class TestPerformanceValidation:
         run_response = client.post(f"/workflows/{workflow_id}/run")
         job_id = run_response.json()["job_id"]
 
-        # Poll for completion
-        max_polls = 60
-        for _ in range(max_polls):
-            job_response = client.get(f"/jobs/{job_id}")
-            job_data = job_response.json()
-
-            if job_data["status"] in ["Succeeded", "Failed"]:
-                break
-
-            time.sleep(0.5)
+        # Long-poll for completion
+        job_data = wait_for_job(job_id, timeout=30)
 
         total_execution_time = time.time() - run_start
 
@@ -206,42 +185,44 @@ class TestPerformanceValidation:
         assert node_addition_time < 5.0, f"Adding 5 nodes took {node_addition_time:.2f}s, expected < 5.0s"
         assert total_execution_time < 30.0, f"5-node workflow execution took {total_execution_time:.2f}s, expected < 30.0s"
 
-    def test_memory_usage_stability(self, client):
+    def test_memory_usage_stability(self, client, wait_for_job):
         """Test that repeated operations don't cause memory leaks"""
-        import psutil
-        import os
-
-        process = psutil.Process(os.getpid())
-        initial_memory = process.memory_info().rss
-
-        # Perform repeated operations
-        for i in range(10):
+        def run_once(i):
             # Create workflow
-            workflow_response = client.post("/workflows", json={"name": f"Memory Test {i}"})
+            workflow_response = jpost(client, "/workflows", {"name": f"Memory Test {i}"})
             workflow_id = workflow_response.json()["id"]
 
             # Add node
-            client.post(f"/workflows/{workflow_id}/nodes", json={
-                "node_type": "formatter",
-                "config": {"rules": ["lowercase"]}
-            })
+            jpost(client, f"/workflows/{workflow_id}/nodes", LOWERCASE_FORMATTER_NODE)
 
             # Run workflow
             run_response = client.post(f"/workflows/{workflow_id}/run")
             job_id = run_response.json()["job_id"]
 
             # Wait for completion
-            for _ in range(20):
-                job_response = client.get(f"/jobs/{job_id}")
-                if job_response.json()["status"] in ["Succeeded", "Failed"]:
-                    break
-                time.sleep(0.1)
+            wait_for_job(job_id, timeout=2)
+
+        # Only count allocations made from application code (anywhere in the last 5 frames)
+        server_only = (tracemalloc.Filter(True, "*/server/*", all_frames=True),)
 
-        final_memory = process.memory_info().rss
-        memory_increase = (final_memory - initial_memory) / 1024 / 1024  # MB
+        tracemalloc.start(5)
+        try:
+            # Warm up caches and lazily-built state before the baseline snapshot
+            run_once(0)
+            baseline = tracemalloc.take_snapshot().filter_traces(server_only)
+
+            # Perform repeated operations
+            for i in range(1, 10):
+                run_once(i)
+            final = tracemalloc.take_snapshot().filter_traces(server_only)
+        finally:
+            tracemalloc.stop()
+
+        stats = final.compare_to(baseline, "lineno")
+        memory_increase = sum(stat.size_diff for stat in stats) / 1024 / 1024  # MB
 
         # Allow for some memory growth but not excessive
-        assert memory_increase < 100, f"Memory increased by {memory_increase:.2f}MB, expected < 100MB"
+        assert memory_increase < 5, f"Memory increased by {memory_increase:.2f}MB, expected < 5MB"
 
     def test_api_response_times_documentation(self, client):
         """Document expected API response times for reference"""
@@ -289,24 +270,24 @@ class TestPerformanceValidation:
         for endpoint, duration in endpoints_performance.items():
             assert duration < 2.0, f"{endpoint} took {duration:.3f}s, expected < 2.0s"
 
-    def test_database_query_performance(self, client):
+    @pytest.mark.asyncio
+    async def test_database_query_performance(self, async_client):
         """Test database operations perform within acceptable limits"""
-        # Create multiple workflows to test query performance
-        workflow_ids = []
-
+        # Create multiple workflows concurrently to test query performance
         creation_start = time.time()
-        for i in range(10):
-            response = client.post("/workflows", json={"name": f"DB Test Workflow {i}"})
-            workflow_ids.append(response.json()["id"])
+        responses = await asyncio.gather(*(
+            jpost(async_client, "/workflows", {"name": f"DB Test Workflow {i}"}) for i in range(10)
+        ))
+        workflow_ids = [response.json()["id"] for response in responses]
         creation_time = time.time() - creation_start
 
         # Test retrieval performance
         retrieval_start = time.time()
         for workflow_id in workflow_ids:
-            client.get(f"/workflows/{workflow_id}")
+            await async_client.get(f"/workflows/{workflow_id}")
         retrieval_time = time.time() - retrieval_start
 
-        assert creation_time < 10.0, f"Creating 10 workflows took {creation_time:.2f}s, expected < 10.0s"
+        assert creation_time < 2.0, f"Creating 10 workflows took {creation_time:.2f}s, expected < 2.0s"
         assert retrieval_time < 5.0, f"Retrieving 10 workflows took {retrieval_time:.2f}s, expected < 5.0s"
 
     def test_error_handling_performance(self, client):
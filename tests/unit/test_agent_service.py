@@ -1,6 +1,6 @@
 import pytest
 import asyncio
-from unittest.mock import patch, AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 from server.services.agent_service import validate_config, execute_agent_bounded
 
 
@@ -156,12 +156,52 @@ class TestAgentConfigValidation:
         assert is_valid is False
         assert "validation error" in error_msg
 
+    def test_validate_config_keeps_types_distinct(self):
+        """Test configs that compare equal but differ in type are validated by their own type"""
+        base = {
+            "objective": "Process text",
+            "tools": ["llm_call"],
+            "budgets": {"execution_time": 30}
+        }
+
+        assert validate_config({**base, "max_concurrent": 2})[0] is True
+        assert validate_config({**base, "max_concurrent": 2.0})[0] is False
+        assert validate_config({**base, "tools": ("llm_call",)})[0] is False
+
+    def test_validate_config_unhashable_values(self):
+        """Test configs with unhashable values are still validated"""
+        config = {
+            "objective": "Process text",
+            "tools": ["llm_call"],
+            "budgets": {"execution_time": 30},
+            "extra": {"llm_call"}
+        }
+
+        assert validate_config(config) == (True, "")
+
+
+@pytest.fixture
+def mock_llm(monkeypatch):
+    """Swap the agent's llm_service for a mock; tests set call_llm per scenario"""
+    llm = MagicMock()
+    monkeypatch.setattr("server.services.agent_service.llm_service", llm)
+    return llm
+
 
+@pytest.fixture
+def mock_formatter(monkeypatch):
+    """Swap the agent's formatter_service for a mock"""
+    formatter = MagicMock()
+    monkeypatch.setattr("server.services.agent_service.formatter_service", formatter)
+    return formatter
+
+
+# One event loop for the whole class instead of a fresh loop per test
+@pytest.mark.asyncio(loop_scope="class")
 class TestAgentBoundedExecution:
     """Unit tests for agent bounded execution"""
 
-    @pytest.mark.asyncio
-    async def test_execute_agent_bounded_objective_achieved(self):
+    async def test_execute_agent_bounded_objective_achieved(self, mock_llm, mock_formatter):
         """Test agent execution that achieves objective"""
         config = {
             "objective": "Format text to lowercase",
@@ -171,21 +211,17 @@ class TestAgentBoundedExecution:
             "formatting_rules": ["lowercase"]
         }
 
-        with patch('server.services.agent_service.llm_service') as mock_llm, \
-             patch('server.services.agent_service.formatter_service') as mock_formatter:
-
-            # Mock LLM to return "complete" on first call
-            mock_llm.call_llm = AsyncMock(return_value="complete")
+        # Mock LLM to return "complete" on first call
+        mock_llm.call_llm = AsyncMock(return_value="complete")
 
-            result = await execute_agent_bounded(config, "TEST INPUT")
+        result = await execute_agent_bounded(config, "TEST INPUT")
 
-            assert result["termination_reason"] == "objective_achieved"
-            assert result["iterations"] == 1
-            assert "execution_time" in result
-            assert result["output_text"] == "TEST INPUT"
+        assert result["termination_reason"] == "objective_achieved"
+        assert result["iterations"] == 1
+        assert "execution_time" in result
+        assert result["output_text"] == "TEST INPUT"
 
-    @pytest.mark.asyncio
-    async def test_execute_agent_bounded_max_iterations(self):
+    async def test_execute_agent_bounded_max_iterations(self, mock_llm):
         """Test agent execution that hits max iterations"""
         config = {
             "objective": "Impossible task",
@@ -194,18 +230,16 @@ class TestAgentBoundedExecution:
             "max_iterations": 2
         }
 
-        with patch('server.services.agent_service.llm_service') as mock_llm:
-            # Mock LLM to never return "complete"
-            mock_llm.call_llm = AsyncMock(return_value="continue")
+        # Mock LLM to never return "complete"
+        mock_llm.call_llm = AsyncMock(return_value="continue")
 
-            result = await execute_agent_bounded(config, "TEST INPUT")
+        result = await execute_agent_bounded(config, "TEST INPUT")
 
-            assert result["termination_reason"] == "max_iterations_reached"
-            assert result["iterations"] == 2
-            assert "execution_time" in result
+        assert result["termination_reason"] == "max_iterations_reached"
+        assert result["iterations"] == 2
+        assert "execution_time" in result
 
-    @pytest.mark.asyncio
-    async def test_execute_agent_bounded_timeout(self):
+    async def test_execute_agent_bounded_timeout(self, mock_llm):
         """Test agent execution that times out"""
         config = {
             "objective": "Process text",
@@ -215,21 +249,19 @@ class TestAgentBoundedExecution:
             "max_iterations": 10
         }
 
-        with patch('server.services.agent_service.llm_service') as mock_llm:
-            # Mock LLM with delay
-            async def slow_llm_call(*args, **kwargs):
-                await asyncio.sleep(0.2)  # Longer than timeout
-                return "continue"
+        # Mock LLM with delay
+        async def slow_llm_call(*args, **kwargs):
+            await asyncio.sleep(0.2)  # Longer than timeout
+            return "continue"
 
-            mock_llm.call_llm = slow_llm_call
+        mock_llm.call_llm = slow_llm_call
 
-            result = await execute_agent_bounded(config, "TEST INPUT")
+        result = await execute_agent_bounded(config, "TEST INPUT")
 
-            assert result["termination_reason"] == "timeout_exceeded"
-            assert "execution_time" in result
+        assert result["termination_reason"] == "timeout_exceeded"
+        assert "execution_time" in result
 
-    @pytest.mark.asyncio
-    async def test_execute_agent_bounded_llm_timeout_retry(self):
+    async def test_execute_agent_bounded_llm_timeout_retry(self, mock_llm, monkeypatch):
         """Test agent execution with LLM timeout and retry logic"""
         config = {
             "objective": "Process text",
@@ -240,26 +272,20 @@ class TestAgentBoundedExecution:
             "max_iterations": 3
         }
 
-        with patch('server.services.agent_service.llm_service') as mock_llm:
-            # Mock LLM to timeout on first calls, succeed on later call
-            call_count = 0
+        mock_sleep = AsyncMock()
+        monkeypatch.setattr("server.services.agent_service._backoff_sleep", mock_sleep)
 
-            async def mock_llm_call(*args, **kwargs):
-                nonlocal call_count
-                call_count += 1
-                if call_count <= 2:
-                    raise asyncio.TimeoutError()
-                return "complete"
+        # Mock LLM to timeout on first calls, succeed on later call
+        mock_llm.call_llm = AsyncMock(side_effect=[asyncio.TimeoutError(), asyncio.TimeoutError(), "complete"])
 
-            mock_llm.call_llm = mock_llm_call
+        result = await execute_agent_bounded(config, "TEST INPUT")
 
-            result = await execute_agent_bounded(config, "TEST INPUT")
+        assert result["termination_reason"] == "objective_achieved"
+        assert mock_llm.call_llm.await_count == 3  # Failed twice, succeeded on third
+        # Capped exponential backoff between attempts
+        assert [call.args[0] for call in mock_sleep.await_args_list] == [0.05, 0.1]
 
-            assert result["termination_reason"] == "objective_achieved"
-            assert call_count == 3  # Failed twice, succeeded on third
-
-    @pytest.mark.asyncio
-    async def test_execute_agent_bounded_formatter_tool(self):
+    async def test_execute_agent_bounded_formatter_tool(self, mock_llm, mock_formatter):
         """Test agent execution using formatter tool"""
         config = {
             "objective": "Format text",
@@ -269,21 +295,17 @@ class TestAgentBoundedExecution:
             "formatting_rules": ["lowercase"]
         }
 
-        with patch('server.services.agent_service.llm_service') as mock_llm, \
-             patch('server.services.agent_service.formatter_service') as mock_formatter:
-
-            # Mock LLM to choose formatter action
-            mock_llm.call_llm = AsyncMock(return_value="formatter")
-            mock_formatter.format_text = lambda text, config: text.lower()
+        # Mock LLM to choose formatter action
+        mock_llm.call_llm = AsyncMock(return_value="formatter")
+        mock_formatter.format_text = lambda text, config: text.lower()
 
-            result = await execute_agent_bounded(config, "TEST INPUT")
+        result = await execute_agent_bounded(config, "TEST INPUT")
 
-            # Should have used formatter tool
-            assert "execution_time" in result
-            assert result["iterations"] >= 1
+        # Should have used formatter tool
+        assert "execution_time" in result
+        assert result["iterations"] >= 1
 
-    @pytest.mark.asyncio
-    async def test_execute_agent_bounded_error_handling(self):
+    async def test_execute_agent_bounded_error_handling(self, mock_llm):
         """Test agent execution error handling"""
         config = {
             "objective": "Process text",
@@ -292,12 +314,11 @@ class TestAgentBoundedExecution:
             "max_iterations": 1
         }
 
-        with patch('server.services.agent_service.llm_service') as mock_llm:
-            # Mock LLM to raise exception
-            mock_llm.call_llm = AsyncMock(side_effect=Exception("LLM Error"))
+        # Mock LLM to raise exception
+        mock_llm.call_llm = AsyncMock(side_effect=Exception("LLM Error"))
 
-            result = await execute_agent_bounded(config, "TEST INPUT")
+        result = await execute_agent_bounded(config, "TEST INPUT")
 
-            assert result["termination_reason"] == "error"
-            assert "error_message" in result
-            assert "LLM Error" in result["error_message"]
\ No newline at end of file
+        assert result["termination_reason"] == "error"
+        assert "error_message" in result
+        assert "LLM Error" in result["error_message"]
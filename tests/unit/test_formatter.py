@@ -115,6 +115,15 @@ class TestFormatterService:
         result = self.formatter.apply_rules(text, ["lowercase", "lowercase", "lowercase"])
         assert result == "hello world"
 
+    def test_consecutive_same_rules_single_pass(self):
+        """Test a run of the same rule is applied only once"""
+        calls = []
+        self.formatter._rule_handlers["lowercase"] = lambda text: calls.append(text) or text.lower()
+
+        result = self.formatter.apply_rules("Hello World", ["lowercase", "lowercase", "uppercase", "lowercase"])
+        assert result == "hello world"
+        assert len(calls) == 2
+
     def test_reversible_rules(self):
         """Test that some rules are reversible"""
         original = "Hello World"
@@ -3,6 +3,7 @@ from server.services.graph_service import (
     validate_edges_no_cycles,
     topo_schedule,
     get_node_dependencies,
+    build_predecessor_index,
     aggregate_inputs
 )
 from server.db_models import EdgeDB, NodeDB
@@ -10,12 +11,16 @@ from server.db_models import EdgeDB, NodeDB
 
 class MockNode:
     """Mock node for testing"""
+    __slots__ = ("id",)
+
     def __init__(self, node_id: str):
         self.id = node_id
 
 
 class MockEdge:
     """Mock edge for testing"""
+    __slots__ = ("workflow_id", "from_node_id", "from_port", "to_node_id", "to_port", "condition")
+
     def __init__(self, from_node_id: str, to_node_id: str, from_port: str = "output", to_port: str = "input"):
         self.workflow_id = "test-workflow"
         self.from_node_id = from_node_id
@@ -72,6 +77,27 @@ class TestCycleDetection:
         with pytest.raises(Exception, match="Cycle detected"):
             validate_edges_no_cycles("test-workflow", edges, nodes)
 
+    def test_validate_edges_no_cycles_reports_node_on_cycle(self):
+        """Test the reported node is on the cycle, not merely downstream of it"""
+        nodes = [MockNode("A"), MockNode("B"), MockNode("C"), MockNode("D")]
+        edges = [
+            MockEdge("A", "B"),
+            MockEdge("B", "C"),
+            MockEdge("C", "B"),  # Creates cycle B<->C
+            MockEdge("C", "D")
+        ]
+
+        with pytest.raises(Exception, match="Cycle detected involving node: [BC]$"):
+            validate_edges_no_cycles("test-workflow", edges, nodes)
+
+    def test_validate_edges_no_cycles_long_chain(self):
+        """Test a chain deeper than the recursion limit validates without error"""
+        nodes = [MockNode(f"N{i}") for i in range(5000)]
+        edges = [MockEdge(f"N{i}", f"N{i + 1}") for i in range(4999)]
+
+        # Should not raise exception
+        validate_edges_no_cycles("test-workflow", edges, nodes)
+
     def test_validate_edges_no_cycles_diamond_pattern(self):
         """Test cycle detection with diamond pattern (valid DAG)"""
         nodes = [MockNode("A"), MockNode("B"), MockNode("C"), MockNode("D")]
@@ -210,6 +236,19 @@ class TestTopologicalScheduling:
         assert set(batches[2]) == {"N4", "N5"}
         assert batches[3] == ["N6"]
 
+    def test_topo_schedule_batches_sorted(self):
+        """Test batches come out sorted regardless of node and edge order"""
+        nodes = [MockNode("D"), MockNode("C"), MockNode("B"), MockNode("A")]
+        edges = [
+            MockEdge("A", "D"),
+            MockEdge("A", "C"),
+            MockEdge("A", "B")
+        ]
+
+        batches = list(topo_schedule(edges, nodes))
+
+        assert batches == [["A"], ["B", "C", "D"]]
+
 
 class TestNodeDependencies:
     """Unit tests for node dependency resolution"""
@@ -257,6 +296,19 @@ class TestNodeDependencies:
         deps = get_node_dependencies("D", edges)
         assert set(deps) == {"B", "C", "E"}
 
+    def test_get_node_dependencies_with_index(self):
+        """Test lookups through a prebuilt predecessor index match the edge scan"""
+        edges = [
+            MockEdge("A", "B"),
+            MockEdge("A", "C"),
+            MockEdge("B", "D"),
+            MockEdge("C", "D")
+        ]
+        index = build_predecessor_index(edges)
+
+        for node_id in ["A", "B", "C", "D", "UNKNOWN"]:
+            assert get_node_dependencies(node_id, edges, index=index) == get_node_dependencies(node_id, edges)
+
 
 class TestInputAggregation:
     """Unit tests for input aggregation (AND-join semantics)"""
@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+import pytest
+from server.services.job_service import JobService
+
+
+class TestCompletionWait:
+    """Unit tests for long-poll completion waiting"""
+
+    def setup_method(self):
+        self.job_service = JobService()
+
+    @pytest.mark.asyncio
+    async def test_wait_wakes_when_job_finishes(self):
+        """Test waiters return as soon as the completion event fires, not at the timeout"""
+        event = self.job_service._completion_events["job-1"] = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.05, event.set)
+
+        start = time.monotonic()
+        assert await self.job_service.wait_for_completion("job-1", 5) is True
+        assert time.monotonic() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out(self):
+        """Test waiters give up at the timeout when the job is still running"""
+        self.job_service._completion_events["job-1"] = asyncio.Event()
+        assert await self.job_service.wait_for_completion("job-1", 0.05) is False
+
+    @pytest.mark.asyncio
+    async def test_wait_without_event_sleeps_briefly(self):
+        """Test jobs that haven't started yet fall back to a short poll interval"""
+        start = time.monotonic()
+        assert await self.job_service.wait_for_completion("not-started", 5) is False
+        assert time.monotonic() - start < 1
+
+    def test_enqueue_does_not_register_event(self):
+        """Test enqueued jobs only get an event once executed, so unexecuted jobs can't leak one"""
+        assert self.job_service.enqueue_job("wf-1", "job-1") is True
+        assert self.job_service._completion_events == {}
+
+    @pytest.mark.asyncio
+    async def test_execute_job_removes_event(self):
+        """Test execute_job pops its event even when the job can't be found"""
+        class EmptyQuery:
+            def filter(self, *args):
+                return self
+
+            def first(self):
+                return None
+
+        class MissingJobSession:
+            def query(self, *args):
+                return EmptyQuery()
+
+        self.job_service.enqueue_job("wf-1", "job-1")
+        await self.job_service.execute_job(MissingJobSession(), "job-1")
+        assert self.job_service._completion_events == {}
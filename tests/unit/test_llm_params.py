@@ -1,12 +1,17 @@
 import pytest
-from server.services.llm_service import LLMService
+from server.services.llm_service import LLMService, _validate_fields_cached
 
 
 class TestLLMParameterValidation:
     """Unit tests for LLM service parameter validation"""
 
-    def setup_method(self):
-        self.llm_service = LLMService()
+    # Minimal valid config; parameter tests merge in the one field they vary
+    BASE_CONFIG = {"model": "gpt-4.1-mini", "prompt": "Test: {text}"}
+
+    @classmethod
+    def setup_class(cls):
+        # validate_config keeps no state, so one service serves every test in the class
+        cls.llm_service = LLMService()
 
     def test_valid_minimal_config(self):
         """Test minimal valid configuration"""
@@ -71,108 +76,92 @@ class TestLLMParameterValidation:
         assert "{text}" in error
         assert "placeholder" in error
 
-    def test_temperature_validation_boundaries(self):
-        """Test temperature parameter boundary validation"""
-        # Valid temperatures
-        for temp in [0.0, 0.5, 1.0, 1.5, 2.0]:
-            config = {
-                "model": "gpt-4.1-mini",
-                "prompt": "Test: {text}",
-                "temperature": temp
-            }
-            is_valid, error = self.llm_service.validate_config(config)
-            assert is_valid is True, f"Temperature {temp} should be valid"
+    @pytest.mark.parametrize("temp", [0.0, 0.5, 1.0, 1.5, 2.0])
+    def test_temperature_valid_boundaries(self, temp):
+        """Test temperatures within range are accepted"""
+        config = self.BASE_CONFIG | {"temperature": temp}
+        is_valid, error = self.llm_service.validate_config(config)
+        assert is_valid is True, f"Temperature {temp} should be valid"
 
-        # Invalid temperatures
-        for temp in [-0.1, 2.1, -1.0, 3.0]:
-            config = {
-                "model": "gpt-4.1-mini",
-                "prompt": "Test: {text}",
-                "temperature": temp
-            }
-            is_valid, error = self.llm_service.validate_config(config)
-            assert is_valid is False, f"Temperature {temp} should be invalid"
-            assert "Temperature must be a number between 0.0 and 2.0" in error
+    @pytest.mark.parametrize("temp", [-0.1, 2.1, -1.0, 3.0])
+    def test_temperature_invalid_boundaries(self, temp):
+        """Test temperatures out of range are rejected"""
+        config = self.BASE_CONFIG | {"temperature": temp}
+        is_valid, error = self.llm_service.validate_config(config)
+        assert is_valid is False, f"Temperature {temp} should be invalid"
+        assert "Temperature must be a number between 0.0 and 2.0" in error
 
     def test_temperature_type_validation(self):
         """Test temperature parameter type validation"""
-        config = {
-            "model": "gpt-4.1-mini",
-            "prompt": "Test: {text}",
-            "temperature": "invalid"
-        }
+        config = self.BASE_CONFIG | {"temperature": "invalid"}
         is_valid, error = self.llm_service.validate_config(config)
         assert is_valid is False
         assert "Temperature must be a number" in error
 
-    def test_max_tokens_validation_boundaries(self):
-        """Test max_tokens parameter boundary validation"""
-        # Valid max_tokens
-        for tokens in [1, 100, 1000, 4096]:
-            config = {
-                "model": "gpt-4.1-mini",
-                "prompt": "Test: {text}",
-                "max_tokens": tokens
-            }
-            is_valid, error = self.llm_service.validate_config(config)
-            assert is_valid is True, f"max_tokens {tokens} should be valid"
+    @pytest.mark.parametrize("tokens", [1, 100, 1000, 4096])
+    def test_max_tokens_valid_boundaries(self, tokens):
+        """Test max_tokens within range are accepted"""
+        config = self.BASE_CONFIG | {"max_tokens": tokens}
+        is_valid, error = self.llm_service.validate_config(config)
+        assert is_valid is True, f"max_tokens {tokens} should be valid"
 
-        # Invalid max_tokens
-        for tokens in [0, -1, 4097, 10000]:
-            config = {
-                "model": "gpt-4.1-mini",
-                "prompt": "Test: {text}",
-                "max_tokens": tokens
-            }
-            is_valid, error = self.llm_service.validate_config(config)
-            assert is_valid is False, f"max_tokens {tokens} should be invalid"
-            assert "max_tokens must be an integer between 1 and 4096" in error
+    @pytest.mark.parametrize("tokens", [0, -1, 4097, 10000])
+    def test_max_tokens_invalid_boundaries(self, tokens):
+        """Test max_tokens out of range are rejected"""
+        config = self.BASE_CONFIG | {"max_tokens": tokens}
+        is_valid, error = self.llm_service.validate_config(config)
+        assert is_valid is False, f"max_tokens {tokens} should be invalid"
+        assert "max_tokens must be an integer between 1 and 4096" in error
 
     def test_max_tokens_type_validation(self):
         """Test max_tokens parameter type validation"""
-        config = {
-            "model": "gpt-4.1-mini",
-            "prompt": "Test: {text}",
-            "max_tokens": 150.5  # Float should be invalid
-        }
+        config = self.BASE_CONFIG | {"max_tokens": 150.5}  # Float should be invalid
         is_valid, error = self.llm_service.validate_config(config)
         assert is_valid is False
         assert "max_tokens must be an integer" in error
 
-    def test_top_p_validation_boundaries(self):
-        """Test top_p parameter boundary validation"""
-        # Valid top_p values
-        for top_p in [0.0, 0.1, 0.5, 0.9, 1.0]:
-            config = {
-                "model": "gpt-4.1-mini",
-                "prompt": "Test: {text}",
-                "top_p": top_p
-            }
-            is_valid, error = self.llm_service.validate_config(config)
-            assert is_valid is True, f"top_p {top_p} should be valid"
+    @pytest.mark.parametrize("top_p", [0.0, 0.1, 0.5, 0.9, 1.0])
+    def test_top_p_valid_boundaries(self, top_p):
+        """Test top_p values within range are accepted"""
+        config = self.BASE_CONFIG | {"top_p": top_p}
+        is_valid, error = self.llm_service.validate_config(config)
+        assert is_valid is True, f"top_p {top_p} should be valid"
 
-        # Invalid top_p values
-        for top_p in [-0.1, 1.1, -1.0, 2.0]:
-            config = {
-                "model": "gpt-4.1-mini",
-                "prompt": "Test: {text}",
-                "top_p": top_p
-            }
-            is_valid, error = self.llm_service.validate_config(config)
-            assert is_valid is False, f"top_p {top_p} should be invalid"
-            assert "top_p must be a number between 0.0 and 1.0" in error
+    @pytest.mark.parametrize("top_p", [-0.1, 1.1, -1.0, 2.0])
+    def test_top_p_invalid_boundaries(self, top_p):
+        """Test top_p values out of range are rejected"""
+        config = self.BASE_CONFIG | {"top_p": top_p}
+        is_valid, error = self.llm_service.validate_config(config)
+        assert is_valid is False, f"top_p {top_p} should be invalid"
+        assert "top_p must be a number between 0.0 and 1.0" in error
 
     def test_top_p_type_validation(self):
         """Test top_p parameter type validation"""
-        config = {
-            "model": "gpt-4.1-mini",
-            "prompt": "Test: {text}",
-            "top_p": "invalid"
-        }
+        config = self.BASE_CONFIG | {"top_p": "invalid"}
         is_valid, error = self.llm_service.validate_config(config)
         assert is_valid is False
         assert "top_p must be a number" in error
 
+    def test_repeat_config_uses_cache(self):
+        """Test validating the same config again is served from the cache"""
+        _validate_fields_cached.cache_clear()
+
+        assert self.llm_service.validate_config(dict(self.BASE_CONFIG)) == (True, None)
+        assert self.llm_service.validate_config(dict(self.BASE_CONFIG)) == (True, None)
+        assert _validate_fields_cached.cache_info().hits == 1
+
+    def test_cache_keeps_numeric_types_distinct(self):
+        """Test equal values of different types aren't conflated by the cache"""
+        assert self.llm_service.validate_config(self.BASE_CONFIG | {"max_tokens": 1})[0] is True
+        assert self.llm_service.validate_config(self.BASE_CONFIG | {"max_tokens": 1.0})[0] is False
+
+    def test_unhashable_values_validated(self):
+        """Test configs with unhashable values skip the cache but are still validated"""
+        config = self.BASE_CONFIG | {"temperature": [0.5]}
+        is_valid, error = self.llm_service.validate_config(config)
+        assert is_valid is False
+        assert "Temperature must be a number" in error
+
     def test_supported_models_list(self):
         """Test all supported models are accepted"""
         supported_models = ["gpt-4.1-mini", "gpt-4o", "gpt-5"]
@@ -234,11 +223,7 @@ class TestLLMParameterValidation:
     def test_validation_error_handling(self):
         """Test that validation handles unexpected errors gracefully"""
         # This test ensures the try-catch in validate_config works
-        config = {
-            "model": "gpt-4.1-mini",
-            "prompt": "Test: {text}",
-            "temperature": float('inf')  # This might cause an unexpected error
-        }
+        config = self.BASE_CONFIG | {"temperature": float('inf')}  # This might cause an unexpected error
         is_valid, error = self.llm_service.validate_config(config)
         assert is_valid is False
         assert error is not None
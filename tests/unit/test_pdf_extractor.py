@@ -1,125 +1,61 @@
 import pytest
 import io
-import tempfile
+import multiprocessing
 import os
-from unittest.mock import patch, MagicMock
-from server.services.pdf_service import PDFService
-from fastapi import UploadFile
-
-
-class TestPDFExtractor:
-    """Unit tests for PDF text extraction service - happy and edge cases"""
-
-    def setup_method(self):
-        self.pdf_service = PDFService()
-
-    def create_test_pdf_content(self, text_content="Test PDF Content"):
-        """Helper method to create valid PDF content for testing"""
-        # Minimal valid PDF structure with text
-        pdf_content = f"""%PDF-1.4
-1 0 obj
-<<
-/Type /Catalog
-/Pages 2 0 R
->>
-endobj
-2 0 obj
-<<
-/Type /Pages
-/Kids [3 0 R]
-/Count 1
->>
-endobj
-3 0 obj
-<<
-/Type /Page
-/Parent 2 0 R
-/MediaBox [0 0 612 792]
-/Contents 4 0 R
->>
-endobj
-4 0 obj
-<<
-/Length {len(text_content) + 20}
->>
-stream
-BT
-/F1 12 Tf
-72 720 Td
-({text_content}) Tj
-ET
-endstream
-endobj
-xref
-0 5
-0000000000 65535 f
-0000000009 00000 n
-0000000074 00000 n
-0000000120 00000 n
-0000000179 00000 n
-trailer
-<<
-/Size 5
-/Root 1 0 R
->>
-startxref
-{250 + len(text_content)}
-%%EOF"""
-        return pdf_content.encode('utf-8')
-
-    def test_extract_text_simple_pdf(self):
-        """Test successful text extraction from simple PDF"""
-        pdf_content = self.create_test_pdf_content("Hello World")
-
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
-            tmp_file.write(pdf_content)
-            tmp_file.flush()
-
-            try:
-                extracted_text = self.pdf_service.extract_text(tmp_file.name)
-                assert "Hello World" in extracted_text
-                assert len(extracted_text.strip()) > 0
-            finally:
-                os.unlink(tmp_file.name)
-
-    def test_extract_text_multiline_content(self):
-        """Test extraction from PDF with multiple lines"""
-        multiline_content = "Line 1\\nLine 2\\nLine 3"
-        pdf_content = self.create_test_pdf_content(multiline_content)
-
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
-            tmp_file.write(pdf_content)
-            tmp_file.flush()
-
-            try:
-                extracted_text = self.pdf_service.extract_text(tmp_file.name)
-                # Note: PDF text extraction might not preserve exact newlines
-                assert "Line 1" in extracted_text
-                assert "Line 2" in extracted_text
-                assert "Line 3" in extracted_text
-            finally:
-                os.unlink(tmp_file.name)
-
-    def test_extract_text_special_characters(self):
-        """Test extraction with special characters"""
-        special_content = "Café naïve résumé @#$%^&*()"
-        pdf_content = self.create_test_pdf_content(special_content)
-
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
-            tmp_file.write(pdf_content)
-            tmp_file.flush()
-
-            try:
-                extracted_text = self.pdf_service.extract_text(tmp_file.name)
-                # Basic characters should be extracted
-                assert "Caf" in extracted_text or "naiv" in extracted_text
-            finally:
-                os.unlink(tmp_file.name)
-
-    def test_extract_text_empty_pdf(self):
-        """Test extraction from PDF with no text content"""
-        # PDF with no text content
-        empty_pdf = b"""%PDF-1.4
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+# Skip the module, rather than erroring at collection, when the PDF backend isn't installed
+pypdf = pytest.importorskip("pypdf")
+
+from server.services.pdf_service import PDFExtractionTimeout, PDFService, PDFValidationError
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+
+@lru_cache(maxsize=128)
+def _build_pdf(text_content: str = "Test PDF Content") -> bytes:
+    """Build a minimal valid PDF around the text; deterministic, so built once per text
+
+    Objects are appended in order and their byte offsets recorded as they are written,
+    so the xref table and startxref are exact and pypdf never falls back to recovery.
+    """
+    stream = f"BT /F1 12 Tf 72 720 Td ({text_content}) Tj ET".encode('utf-8')
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref_offset = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF" % (len(objects) + 1, xref_offset)
+    return bytes(pdf)
+
+
+def _build_multipage_pdf(*page_texts: str) -> bytes:
+    """Join single-page test PDFs, one page per text, into one document"""
+    writer = pypdf.PdfWriter()
+    for text_content in page_texts:
+        writer.add_page(pypdf.PdfReader(io.BytesIO(_build_pdf(text_content))).pages[0])
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+# PDF whose single page has no content stream, so no text
+_EMPTY_PDF = b"""%PDF-1.4
 1 0 obj
 <<
 /Type /Catalog
@@ -155,219 +91,387 @@ startxref
 193
 %%EOF"""
 
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
-            tmp_file.write(empty_pdf)
-            tmp_file.flush()
 
-            try:
-                extracted_text = self.pdf_service.extract_text(tmp_file.name)
-                assert extracted_text == "" or extracted_text.strip() == ""
-            finally:
-                os.unlink(tmp_file.name)
+@pytest.fixture(scope="session")
+def pdf_service(tmp_path_factory):
+    """One shared service per session (per worker under pytest-xdist)
+
+    Stored files go to a private temp dir instead of the shared uploads/ directory,
+    so parallel workers never clean up each other's files.
+    """
+    return PDFService(upload_dir=str(tmp_path_factory.mktemp("uploads")))
+
+
+@pytest.fixture(scope="module")
+def pdf_bytes():
+    """Valid PDF payload shared by the module's upload tests"""
+    return _build_pdf("Valid PDF")
+
+
+@pytest.fixture
+def valid_upload(pdf_bytes):
+    """Fresh upload per test; only the cheap BytesIO wrapper is rebuilt, never the PDF"""
+    return UploadFile(
+        filename="test.pdf",
+        file=io.BytesIO(pdf_bytes),
+        headers=Headers({"content-type": "application/pdf"})
+    )
+
 
-    def test_extract_text_nonexistent_file(self):
+class _SizedFake(io.RawIOBase):
+    """Stream that reports a size through seek/tell but holds only a PDF header"""
+
+    def __init__(self, size):
+        self._size = size
+        self._pos = 0
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._pos = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self._size}[whence] + offset
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return b"%PDF-1.4" if self._pos == 0 else b""
+
+
+class TestPDFExtractor:
+    """Unit tests for PDF text extraction service - happy and edge cases"""
+
+    def _make_pdf_buffer(self, text_content="Test PDF Content"):
+        """Wrap the test PDF in an in-memory stream so extraction never touches disk"""
+        return io.BytesIO(_build_pdf(text_content))
+
+    @pytest.mark.parametrize("text_content, expected_substrings, min_length", [
+        pytest.param("Hello World", ["Hello World"], 1, id="simple"),
+        # Note: PDF text extraction might not preserve exact newlines
+        pytest.param("Line 1\\nLine 2\\nLine 3", ["Line 1", "Line 2", "Line 3"], 1, id="multiline"),
+        # Basic characters should be extracted
+        pytest.param("Café naïve résumé @#$%^&*()", ["Caf"], 1, id="special_characters"),
+        # Just enough text to clear 1000 characters (28 chars x 40 = 1120); extraction time
+        # grows with content-stream length, so keep it sized to the assertion
+        pytest.param("Lorem ipsum dolor sit amet. " * 40, ["Lorem ipsum"], 1001, id="large_content"),
+    ])
+    def test_extract_text(self, pdf_service, text_content, expected_substrings, min_length):
+        """Test successful text extraction across simple, multiline, special and large content"""
+        extracted_text = pdf_service.extract_text(self._make_pdf_buffer(text_content))
+        for expected in expected_substrings:
+            assert expected in extracted_text
+        assert len(extracted_text.strip()) >= min_length
+
+    def test_extract_text_empty_pdf(self, pdf_service):
+        """Test extraction from PDF with no text content"""
+        extracted_text = pdf_service.extract_text(io.BytesIO(_EMPTY_PDF))
+        assert extracted_text == "No text content found in PDF"
+
+    def test_extract_text_empty_pdf_uses_fast_path(self, pdf_service, monkeypatch):
+        """Test that pages without a content stream never reach pypdf's text extractor"""
+        extractor_calls = []
+        monkeypatch.setattr(
+            pypdf.PageObject, "extract_text", lambda page, *args, **kwargs: extractor_calls.append(page)
+        )
+
+        extracted_text = pdf_service.extract_text(io.BytesIO(_EMPTY_PDF))
+        assert extracted_text == "No text content found in PDF"
+        assert extractor_calls == []
+
+    def test_extract_text_from_path(self, pdf_service, tmp_path):
+        """Test extraction from a stored file that isn't in the reader cache"""
+        pdf_path = tmp_path / "stored.pdf"
+        pdf_path.write_bytes(_build_pdf("Stored text"))
+        assert pdf_service.extract_text(str(pdf_path)) == "Stored text"
+
+    def test_extract_text_from_path_rejects_non_pdf(self, pdf_service, tmp_path):
+        """Test a stored file without a PDF header is rejected before parsing"""
+        text_path = tmp_path / "notes.pdf"
+        text_path.write_bytes(b"plain text, not a PDF")
+        with pytest.raises(HTTPException) as exc_info:
+            pdf_service.extract_text(str(text_path))
+        assert exc_info.value.status_code == 400
+
+    def test_extract_text_nonexistent_file(self, pdf_service):
         """Test extraction fails gracefully for nonexistent file"""
-        with pytest.raises(FileNotFoundError):
-            self.pdf_service.extract_text("/nonexistent/file.pdf")
+        with pytest.raises(HTTPException) as exc_info:
+            pdf_service.extract_text("/nonexistent/file.pdf")
+        assert exc_info.value.status_code == 404
 
-    def test_extract_text_corrupted_pdf(self):
+    def test_extract_text_corrupted_pdf(self, pdf_service):
         """Test extraction handles corrupted PDF gracefully"""
         corrupted_content = b"This is not a valid PDF file content"
 
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
-            tmp_file.write(corrupted_content)
-            tmp_file.flush()
-
-            try:
-                with pytest.raises(Exception):  # Should raise some PDF parsing error
-                    self.pdf_service.extract_text(tmp_file.name)
-            finally:
-                os.unlink(tmp_file.name)
-
-    def test_extract_text_large_content(self):
-        """Test extraction from PDF with large text content"""
-        large_content = "Lorem ipsum dolor sit amet. " * 100  # Large text
-        pdf_content = self.create_test_pdf_content(large_content)
-
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
-            tmp_file.write(pdf_content)
-            tmp_file.flush()
-
-            try:
-                extracted_text = self.pdf_service.extract_text(tmp_file.name)
-                assert "Lorem ipsum" in extracted_text
-                assert len(extracted_text) > 1000  # Should extract substantial content
-            finally:
-                os.unlink(tmp_file.name)
-
-    def test_validate_pdf_valid_file(self):
-        """Test PDF validation for valid file"""
-        pdf_content = self.create_test_pdf_content("Valid PDF")
+        with pytest.raises(HTTPException) as exc_info:
+            pdf_service.extract_text(io.BytesIO(corrupted_content))
+        assert exc_info.value.status_code == 400
 
-        upload_file = UploadFile(
-            filename="test.pdf",
-            file=io.BytesIO(pdf_content),
-            content_type="application/pdf"
-        )
-
-        is_valid, error = self.pdf_service.validate_pdf(upload_file)
+    def test_validate_pdf_valid_file(self, pdf_service, valid_upload):
+        """Test PDF validation for valid file"""
+        is_valid, error = pdf_service.validate_pdf(valid_upload)
         assert is_valid is True
         assert error is None
 
-    def test_validate_pdf_wrong_mime_type(self):
+    def test_validate_pdf_wrong_mime_type(self, pdf_service):
         """Test PDF validation rejects wrong MIME type"""
         upload_file = UploadFile(
             filename="test.pdf",
             file=io.BytesIO(b"Not a PDF"),
-            content_type="text/plain"
+            headers=Headers({"content-type": "text/plain"})
         )
 
-        is_valid, error = self.pdf_service.validate_pdf(upload_file)
+        is_valid, error = pdf_service.validate_pdf(upload_file)
         assert is_valid is False
-        assert "MIME type" in error
+        assert error == PDFValidationError.BAD_MIME
 
-    def test_validate_pdf_no_pdf_header(self):
+    def test_validate_pdf_no_pdf_header(self, pdf_service):
         """Test PDF validation rejects file without PDF header"""
         upload_file = UploadFile(
             filename="test.pdf",
             file=io.BytesIO(b"This is not a PDF file"),
-            content_type="application/pdf"
+            headers=Headers({"content-type": "application/pdf"})
         )
 
-        is_valid, error = self.pdf_service.validate_pdf(upload_file)
+        is_valid, error = pdf_service.validate_pdf(upload_file)
         assert is_valid is False
-        assert "PDF" in error and "header" in error
+        assert error == PDFValidationError.NO_HEADER
 
-    def test_validate_pdf_too_large(self):
+    def test_validate_pdf_too_large(self, pdf_service):
         """Test PDF validation rejects oversized files"""
-        # Create content larger than max size (10MB)
-        large_content = b"x" * (11 * 1024 * 1024)  # 11MB
+        # Report a size larger than max size (10MB) without allocating it
+        upload_file = UploadFile(
+            filename="large.pdf",
+            file=_SizedFake(11 * 1024 * 1024),  # 11MB
+            headers=Headers({"content-type": "application/pdf"})
+        )
 
+        is_valid, error = pdf_service.validate_pdf(upload_file)
+        assert is_valid is False
+        assert error == PDFValidationError.TOO_LARGE
+        assert "Maximum size: 10.0MB" in pdf_service.validation_message(error, upload_file)
+
+    def test_validate_pdf_too_large_by_reported_size(self, pdf_service):
+        """Test PDF validation trusts the size Starlette recorded while parsing the upload"""
         upload_file = UploadFile(
             filename="large.pdf",
-            file=io.BytesIO(large_content),
-            content_type="application/pdf"
+            file=io.BytesIO(b""),
+            size=11 * 1024 * 1024,  # 11MB
+            headers=Headers({"content-type": "application/pdf"})
         )
 
-        is_valid, error = self.pdf_service.validate_pdf(upload_file)
+        is_valid, error = pdf_service.validate_pdf(upload_file)
         assert is_valid is False
-        assert "size" in error.lower()
+        assert error == PDFValidationError.TOO_LARGE
 
-    def test_validate_pdf_empty_file(self):
+    def test_validate_pdf_empty_file(self, pdf_service):
         """Test PDF validation rejects empty files"""
         upload_file = UploadFile(
             filename="empty.pdf",
             file=io.BytesIO(b""),
-            content_type="application/pdf"
+            headers=Headers({"content-type": "application/pdf"})
+        )
+
+        is_valid, error = pdf_service.validate_pdf(upload_file)
+        assert is_valid is False
+        assert error == PDFValidationError.EMPTY
+
+    def test_validate_pdf_unreadable_reports_detail(self, pdf_service):
+        """Test an unexpected error while reading the upload keeps its detail in the message"""
+        class BrokenStream(io.BytesIO):
+            def read(self, *args):
+                raise OSError("disk read failed")
+
+        upload_file = UploadFile(
+            filename="broken.pdf",
+            file=BrokenStream(b"%PDF-1.4"),
+            headers=Headers({"content-type": "application/pdf"})
         )
 
-        is_valid, error = self.pdf_service.validate_pdf(upload_file)
+        is_valid, error = pdf_service.validate_pdf(upload_file)
         assert is_valid is False
-        assert "empty" in error.lower()
+        assert error == PDFValidationError.UNREADABLE
+        assert pdf_service.validation_message(error, upload_file) == "Error validating file: disk read failed"
 
-    @patch('pypdf.PdfReader')
-    def test_extract_text_with_pypdf_error(self, mock_pdf_reader):
+    def test_extract_text_with_pypdf_error(self, pdf_service, monkeypatch):
         """Test extraction handles pypdf library errors"""
-        mock_pdf_reader.side_effect = Exception("PyPDF error")
+        def failing_reader(*args, **kwargs):
+            raise Exception("PyPDF error")
 
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
-            tmp_file.write(b"dummy content")
-            tmp_file.flush()
+        monkeypatch.setattr("pypdf.PdfReader", failing_reader)
 
-            try:
-                with pytest.raises(Exception):
-                    self.pdf_service.extract_text(tmp_file.name)
-            finally:
-                os.unlink(tmp_file.name)
+        with pytest.raises(Exception):
+            pdf_service.extract_text(io.BytesIO(b"%PDF-1.4 dummy content"))
 
-    def test_store_file_success(self):
+    def test_store_file_success(self, pdf_service, valid_upload, pdf_bytes):
         """Test successful file storage"""
-        pdf_content = self.create_test_pdf_content("Storage test")
+        # Stored files land in the service's pytest temp dir, which pytest cleans up
+        file_id, stored_path = pdf_service.store_file(valid_upload)
 
-        upload_file = UploadFile(
-            filename="storage_test.pdf",
-            file=io.BytesIO(pdf_content),
-            content_type="application/pdf"
-        )
+        assert file_id is not None
+        assert len(file_id) > 0
+        assert stored_path.endswith('.pdf')
+        assert os.path.exists(stored_path)
 
-        file_id, stored_path = self.pdf_service.store_file(upload_file)
+        # Verify file content
+        assert Path(stored_path).read_bytes() == pdf_bytes
 
-        try:
-            assert file_id is not None
-            assert len(file_id) > 0
-            assert stored_path.endswith('.pdf')
-            assert os.path.exists(stored_path)
+    def test_store_file_creates_directory(self, tmp_path):
+        """Test that the service creates its uploads directory if it doesn't exist"""
+        upload_dir = tmp_path / "not-yet-created" / "uploads"
+        assert not upload_dir.exists()
+        pdf_service = PDFService(upload_dir=str(upload_dir))
 
-            # Verify file content
-            with open(stored_path, 'rb') as f:
-                stored_content = f.read()
-                assert stored_content == pdf_content
+        upload_file = UploadFile(
+            filename="directory_test.pdf",
+            file=io.BytesIO(_build_pdf("Directory test")),
+            headers=Headers({"content-type": "application/pdf"})
+        )
 
-        finally:
-            # Cleanup
-            if os.path.exists(stored_path):
-                os.unlink(stored_path)
+        file_id, stored_path = pdf_service.store_file(upload_file)
 
-    def test_store_file_creates_directory(self):
-        """Test that store_file creates uploads directory if it doesn't exist"""
-        # This test assumes the store_file method creates directories as needed
-        pdf_content = self.create_test_pdf_content("Directory test")
+        assert os.path.isdir(upload_dir)
+        assert os.path.dirname(stored_path) == str(upload_dir)
+        assert os.path.exists(stored_path)
 
+    def test_validate_pdf_unicode_content(self, pdf_service):
+        """Test that a PDF carrying Unicode text passes validation"""
+        # The test PDF has no CID font or /ToUnicode map, so what extraction returns for
+        # non-ASCII text is undefined; only check that the bytes don't break the pipeline
         upload_file = UploadFile(
-            filename="directory_test.pdf",
-            file=io.BytesIO(pdf_content),
-            content_type="application/pdf"
+            filename="unicode.pdf",
+            file=io.BytesIO(_build_pdf("中文 العربية русский")),
+            headers=Headers({"content-type": "application/pdf"})
         )
 
-        file_id, stored_path = self.pdf_service.store_file(upload_file)
-
-        try:
-            assert os.path.exists(os.path.dirname(stored_path))
-            assert os.path.exists(stored_path)
-        finally:
-            if os.path.exists(stored_path):
-                os.unlink(stored_path)
-
-    def test_extract_text_unicode_content(self):
-        """Test extraction with Unicode characters"""
-        unicode_content = "中文 العربية русский"
-        pdf_content = self.create_test_pdf_content(unicode_content)
-
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
-            tmp_file.write(pdf_content)
-            tmp_file.flush()
-
-            try:
-                extracted_text = self.pdf_service.extract_text(tmp_file.name)
-                # Unicode extraction might not be perfect, but should not crash
-                assert isinstance(extracted_text, str)
-                assert len(extracted_text) >= 0
-            finally:
-                os.unlink(tmp_file.name)
-
-    def test_file_cleanup_after_processing(self):
-        """Test that temporary files are properly cleaned up"""
-        pdf_content = self.create_test_pdf_content("Cleanup test")
+        is_valid, error = pdf_service.validate_pdf(upload_file)
+        assert is_valid is True
+        assert error is None
 
+    def test_file_cleanup_after_processing(self, pdf_service, valid_upload):
+        """Test that temporary files are properly cleaned up"""
         # This test would be more meaningful if the service had cleanup methods
         # For now, just ensure basic operations don't leave temp files
-        upload_file = UploadFile(
-            filename="cleanup_test.pdf",
-            file=io.BytesIO(pdf_content),
-            content_type="application/pdf"
-        )
+        upload_file = valid_upload
 
-        is_valid, _ = self.pdf_service.validate_pdf(upload_file)
+        is_valid, _ = pdf_service.validate_pdf(upload_file)
         assert is_valid is True
 
         # Reset file pointer for reuse
         upload_file.file.seek(0)
 
-        file_id, stored_path = self.pdf_service.store_file(upload_file)
-
-        try:
-            extracted_text = self.pdf_service.extract_text(stored_path)
-            assert len(extracted_text) > 0
-        finally:
-            if os.path.exists(stored_path):
-                os.unlink(stored_path)
\ No newline at end of file
+        # Extract straight from the validated upload; storage has its own tests above
+        extracted_text = pdf_service.extract_text(upload_file.file)
+        assert len(extracted_text) > 0
+
+
+class TestPDFExtractionLimits:
+    """Unit tests for page limits, the per-page timeout and the parsed-reader cache"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        """Private service, since these tests inspect and tune its state"""
+        return PDFService(upload_dir=str(tmp_path / "uploads"))
+
+    @pytest.fixture
+    def stuck_pages(self, monkeypatch):
+        """Make page extraction hang while `stuck` is True; released again at teardown"""
+        original_extract = pypdf.PageObject.extract_text
+        release = threading.Event()
+        state = {"stuck": True}
+
+        def extract(page, *args, **kwargs):
+            if state["stuck"]:
+                release.wait(5)
+                return "late text"
+            return original_extract(page, *args, **kwargs)
+
+        monkeypatch.setattr(pypdf.PageObject, "extract_text", extract)
+        yield state
+        release.set()
+
+    def test_max_pages_limits_extraction(self, service):
+        """Test only the first max_pages pages are extracted"""
+        pdf = _build_multipage_pdf("Page one", "Page two", "Page three")
+
+        extracted_text = service.extract_text(pdf, max_pages=2)
+        assert "Page one" in extracted_text
+        assert "Page two" in extracted_text
+        assert "Page three" not in extracted_text
+
+        assert "Page three" in service.extract_text(pdf)
+
+    def test_page_timeout_raises_with_partial_text(self, service, stuck_pages):
+        """Test a page that exceeds the deadline stops extraction with an error naming the page"""
+        service.page_timeout_seconds = 0.05
+
+        with pytest.raises(PDFExtractionTimeout) as exc_info:
+            service.extract_text(_build_pdf("Hello World"))
+        assert exc_info.value.page_number == 1
+        assert exc_info.value.partial_text == ""
+        assert str(exc_info.value) == "Text extraction stopped at page 1: timed out after 0.05s"
+
+    def test_stuck_pages_do_not_leak_workers(self, service, stuck_pages):
+        """Test timed-out pages are killed with their worker and don't block the next extraction"""
+        service.page_timeout_seconds = 0.05
+        for _ in range(3):
+            with pytest.raises(PDFExtractionTimeout):
+                service.extract_text(_build_pdf("Hello World"))
+        assert multiprocessing.active_children() == []
+
+        stuck_pages["stuck"] = False
+        service.page_timeout_seconds = 5.0
+        assert service.extract_text(_build_pdf("Hello World")) == "Hello World"
+
+    def test_stored_file_reuses_validated_reader(self, service, valid_upload, monkeypatch):
+        """Test the reader parsed by validate_pdf serves extract_text for the stored path"""
+        is_valid, _ = service.validate_pdf(valid_upload)
+        assert is_valid is True
+        _, stored_path = service.store_file(valid_upload)
+        assert stored_path in service._reader_cache
+
+        def no_parsing(*args, **kwargs):
+            raise AssertionError("stored PDF was parsed again")
+
+        monkeypatch.setattr("pypdf.PdfReader", no_parsing)
+        assert "Valid PDF" in service.extract_text(stored_path)
+        assert stored_path in service._reader_cache
+        assert "Valid PDF" in service.extract_text(stored_path)
+
+    def test_cached_reader_is_not_shared_while_in_use(self, service, valid_upload, monkeypatch):
+        """Test a caller takes the cached reader out while extracting, so concurrent callers parse their own"""
+        assert service.validate_pdf(valid_upload)[0] is True
+        _, stored_path = service.store_file(valid_upload)
+        cached_during_extraction = []
+
+        def extract_page_texts(pages, label):
+            cached_during_extraction.append(stored_path in service._reader_cache)
+            return ["Valid PDF"], None
+
+        monkeypatch.setattr(service, "_extract_page_texts", extract_page_texts)
+        assert service.extract_text(stored_path) == "Valid PDF"
+        assert cached_during_extraction == [False]
+        assert stored_path in service._reader_cache
+
+    def test_reader_cache_is_bounded_by_bytes_and_evicted_on_delete(self, service, pdf_bytes):
+        """Test the reader cache holds at most reader_cache_max_bytes of PDFs and drops deleted files"""
+        service.reader_cache_max_bytes = 4 * len(pdf_bytes)
+        stored_paths = []
+        for index in range(5):
+            upload_file = UploadFile(
+                filename=f"cached_{index}.pdf",
+                file=io.BytesIO(pdf_bytes),
+                headers=Headers({"content-type": "application/pdf"})
+            )
+            assert service.validate_pdf(upload_file)[0] is True
+            stored_paths.append(service.store_file(upload_file)[1])
+
+        assert list(service._reader_cache) == stored_paths[1:]
+        assert service._reader_cache_bytes == 4 * len(pdf_bytes)
+
+        assert service.delete_file(stored_paths[-1]) is True
+        assert stored_paths[-1] not in service._reader_cache
+        assert service._reader_cache_bytes == 3 * len(pdf_bytes)